@@ -0,0 +1,75 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+from yaml import safe_load
+
+import planteye_vision
+from benchmarks.pipeline_benchmark import RESOLUTIONS, run_benchmark
+
+
+EXAMPLE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example')
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark of PlantEye pipelines with synthetic frames')
+    parser.add_argument('--config', action='append', dest='configs',
+                        help='configuration file to benchmark (default: all configurations in example/)')
+    parser.add_argument('--resolution', action='append', dest='resolutions', choices=list(RESOLUTIONS.keys()),
+                        help='resolution of synthetic frames (default: all)')
+    parser.add_argument('--iterations', type=int, default=50, help='measured pipeline executions per run')
+    parser.add_argument('--warmup', type=int, default=5, help='unmeasured pipeline executions per run')
+    parser.add_argument('--memory-iterations', type=int, default=3,
+                        help='pipeline executions per run for memory measurement')
+    parser.add_argument('--output', help='file to write the JSON report to (default: stdout)')
+    parser.add_argument('--log-level', default='WARNING', help='logging level during benchmark')
+    return parser.parse_args()
+
+
+def environment_info():
+    return {'timestamp': datetime.now(timezone.utc).isoformat(),
+            'planteye_vision': planteye_vision.__version__,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()}
+
+
+def main():
+    arguments = parse_arguments()
+    logging.basicConfig(format='%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s [%(module)s.%(funcName)s]',
+                        datefmt='%Y-%m-%d %H:%M:%S', level=arguments.log_level.upper())
+
+    config_paths = arguments.configs
+    if config_paths is None:
+        config_paths = sorted([os.path.join(EXAMPLE_DIRECTORY, file_name) for file_name in os.listdir(EXAMPLE_DIRECTORY)
+                               if file_name.endswith('.yaml')])
+    resolutions = arguments.resolutions or list(RESOLUTIONS.keys())
+
+    runs = []
+    for config_path in config_paths:
+        with open(config_path) as config_file:
+            cfg_dict = safe_load(config_file)
+        for resolution in resolutions:
+            print(f'Benchmark {os.path.basename(config_path)} at {resolution}', file=sys.stderr)
+            runs.append(run_benchmark(os.path.basename(config_path), cfg_dict, resolution, arguments.iterations,
+                                      arguments.warmup, arguments.memory_iterations))
+
+    report = json.dumps({'environment': environment_info(), 'runs': runs}, indent=2)
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            output_file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
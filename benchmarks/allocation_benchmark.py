@@ -0,0 +1,188 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.synthetic_inlet import SyntheticOPCUAInlet
+from planteye_vision.configuration.planteye_configuration import PlantEyeConfiguration
+from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_data import DataChunkValue
+from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
+from planteye_vision.inlet.static_data_inlet import StaticDataInlet
+from planteye_vision.pipeline_execution.pipeline import Pipeline
+from planteye_vision.pipeline_execution.pipeline_executor import PipeLineExecutor
+from planteye_vision.shell.periodical_local_shell import PeriodicalLocalShell
+
+
+METADATA = {'unit': 'none', 'interpretation': 'none', 'description': 'synthetic process value'}
+
+
+class BaselineDataChunk:
+    # Chunk representation before __slots__: attributes in a per-instance __dict__
+    def __init__(self, name: str, chunk_type: str, parameters: dict, hidden: bool = False):
+        self.name = name
+        self.chunk_type = chunk_type
+        self.hidden = hidden
+        self.parameters = parameters
+        self.data = []
+        self.metadata = []
+        self.status = []
+
+
+class BaselineValue:
+    def __init__(self, name: str, value, data_type: str):
+        self.name = name
+        self.value = value
+        self.data_type = data_type
+
+
+class BaselineMetadata:
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
+
+
+class BaselineStatus:
+    # Status representation before shared instances: one object with its own operation and message per chunk
+    def __init__(self, status):
+        self.operation = status.operation
+        self.operation_type = status.operation_type
+        self.code = status.code
+        self.message = status.message
+
+
+def build_cfg_dict(value_inlets: int):
+    inlets = {}
+    for index in range(value_inlets):
+        inlets[2 * index] = {'name': f'static_{index}', 'type': 'static_variable', 'parameters': {'value': index},
+                             'metadata': METADATA}
+        inlets[2 * index + 1] = {'name': f'opcua_{index}', 'type': 'opcua_variable',
+                                 'parameters': {'server': 'opc.tcp://localhost:4840', 'node_ns': 1,
+                                                'node_id': index},
+                                 'metadata': METADATA}
+    return {'inlets': inlets,
+            'processors': {0: {'name': 'input', 'type': 'input', 'input_inlets': ['all']}},
+            'shell': {'type': 'periodical_local', 'parameters': {'time_interval': 1}}}
+
+
+def build_executor(value_inlets: int):
+    config = PlantEyeConfiguration()
+    config.read(build_cfg_dict(value_inlets))
+    executor = PipeLineExecutor(config)
+    executor.shell = PeriodicalLocalShell(config.get_shell_config())
+
+    inlets = []
+    for index, inlet_config in enumerate(config.get_inlet_configs()):
+        if inlet_config.type == 'opcua_variable':
+            inlet = SyntheticOPCUAInlet(inlet_config, seed=index)
+        else:
+            inlet = StaticDataInlet(inlet_config)
+        inlet.apply_configuration()
+        inlets.append(inlet)
+    processors, process_pool = executor.configure_processors()
+    pipeline = Pipeline(inlets, processors, config.get_execution_config(), process_pool)
+    executor.swap_pipeline(pipeline)
+    return executor, pipeline
+
+
+def measure_allocations(executor: PipeLineExecutor, steps: int):
+    # Results of all steps are retained, as in a queue of a staged pipeline
+    tracemalloc.start()
+    try:
+        snapshot_before = tracemalloc.take_snapshot()
+        results = [executor.single_execution() for _ in range(steps)]
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    total_diff = snapshot_after.compare_to(snapshot_before, 'filename')
+    total_blocks = sum([statistic.count_diff for statistic in total_diff])
+    total_bytes = sum([statistic.size_diff for statistic in total_diff])
+    chunks_per_step = len(results[0]) if len(results) > 0 else 0
+    return {'steps': steps,
+            'chunks_per_step': chunks_per_step,
+            'blocks_per_step': round(total_blocks / steps, 1),
+            'bytes_per_step': round(total_bytes / steps, 1)}
+
+
+def copy_chunks(chunks: list, baseline: bool):
+    # The same chunks as produced by a pipeline step, either in the current or in the baseline representation
+    copied_chunks = []
+    for chunk in chunks:
+        if baseline:
+            copied_chunk = BaselineDataChunk(chunk.name, chunk.chunk_type, chunk.parameters, chunk.hidden)
+            copied_chunk.data = [BaselineValue(data.name, data.value, data.data_type) for data in chunk.data]
+            copied_chunk.metadata = [BaselineMetadata(metadata.name, metadata.value) for metadata in chunk.metadata]
+            copied_chunk.status = [BaselineStatus(status) for status in chunk.status]
+        else:
+            copied_chunk = GeneralDataChunk(chunk.name, chunk.chunk_type, chunk.parameters, chunk.hidden)
+            copied_chunk.data = [DataChunkValue(data.name, data.value, data.data_type) for data in chunk.data]
+            copied_chunk.metadata = [MetadataChunkData(metadata.name, metadata.value) for metadata in chunk.metadata]
+            copied_chunk.status = [status.__class__(status.code) for status in chunk.status]
+        copied_chunks.append(copied_chunk)
+    return copied_chunks
+
+
+def measure_representation(executor: PipeLineExecutor, steps: int):
+    # Memory retained by the chunks of a step in the current (slots, shared statuses) and the baseline representation
+    step_chunks = executor.single_execution()
+    report = {}
+    for representation, baseline in [('current', False), ('baseline', True)]:
+        tracemalloc.start()
+        try:
+            snapshot_before = tracemalloc.take_snapshot()
+            results = [copy_chunks(step_chunks, baseline) for _ in range(steps)]
+            snapshot_after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        total_diff = snapshot_after.compare_to(snapshot_before, 'filename')
+        report[representation] = {'blocks_per_step': round(sum([stat.count_diff for stat in total_diff]) / steps, 1),
+                                  'bytes_per_step': round(sum([stat.size_diff for stat in total_diff]) / steps, 1)}
+        del results
+
+    report['reduction'] = {}
+    for measure in ['blocks_per_step', 'bytes_per_step']:
+        baseline_value = report['baseline'][measure]
+        reduction = baseline_value - report['current'][measure]
+        report['reduction'][measure] = round(reduction, 1)
+        report['reduction'][measure + '_percent'] = round(100 * reduction / baseline_value, 1) if baseline_value else 0
+    return report
+
+
+def measure_throughput(executor: PipeLineExecutor, steps: int):
+    begin_time = time.perf_counter()
+    for _ in range(steps):
+        executor.single_execution()
+    duration = time.perf_counter() - begin_time
+    return {'steps': steps, 'steps_per_second': round(steps / duration, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.allocation_benchmark',
+                                     description='Allocation benchmark of a pipeline with static and OPC UA values')
+    parser.add_argument('--value-inlets', type=int, default=25,
+                        help='number of static and of synthetic OPC UA inlets each')
+    parser.add_argument('--steps', type=int, default=1000, help='pipeline executions per measurement')
+    parser.add_argument('--output', help='file to write the JSON report to (default: stdout)')
+    arguments = parser.parse_args()
+
+    executor, pipeline = build_executor(arguments.value_inlets)
+    try:
+        measure_throughput(executor, min(arguments.steps, 100))
+        report = {'value_inlets': 2 * arguments.value_inlets,
+                  'throughput': measure_throughput(executor, arguments.steps),
+                  'allocations': measure_allocations(executor, arguments.steps),
+                  'representation': measure_representation(executor, arguments.steps)}
+    finally:
+        pipeline.release_resources()
+
+    report = json.dumps(report, indent=2)
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            output_file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import copy
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic_inlet import SyntheticCameraInlet, CAMERA_INLET_TYPES
+from planteye_vision.common.metrics import metrics
+from planteye_vision.configuration.planteye_configuration import PlantEyeConfiguration
+from planteye_vision.inlet.static_data_inlet import StaticDataInlet
+from planteye_vision.pipeline_execution.pipeline import Pipeline
+from planteye_vision.pipeline_execution.pipeline_executor import PipeLineExecutor
+from planteye_vision.shell.periodical_local_shell import PeriodicalLocalShell
+from planteye_vision.shell.rest_api_shell import RestAPIShell
+
+
+RESOLUTIONS = {'vga': (640, 480), '1080p': (1920, 1080), '2500x2500': (2500, 2500)}
+
+# Inlets that require external servers and processors that require trained models are not benchmarked
+EXTERNAL_INLET_TYPES = ['opcua_variable', 'restapi']
+MODEL_PROCESSOR_TYPES = ['pt_inference', 'tf_inference']
+
+
+class MemoryProbe:
+    """
+    This class describes a wrapper of a processor execution that measures its peak of traced memory.
+    Probed executions are serialised, so that concurrently executed processors do not distort each other.
+    """
+    def __init__(self, execute, lock: threading.Lock):
+        self.execute = execute
+        self.lock = lock
+        self.peak_memory = 0
+
+    def __call__(self, input_data):
+        with self.lock:
+            tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+            result = self.execute(input_data)
+            _, memory_peak = tracemalloc.get_traced_memory()
+        self.peak_memory = max(self.peak_memory, memory_peak - memory_before)
+        return result
+
+
+def prepare_config(cfg_dict: dict, save_path: str):
+    cfg_dict = copy.deepcopy(cfg_dict)
+    skipped = []
+
+    inlets = {}
+    for key, inlet_cfg in cfg_dict.get('inlets', {}).items():
+        if inlet_cfg.get('type') in EXTERNAL_INLET_TYPES:
+            skipped.append({'component': 'inlet', 'name': inlet_cfg.get('name'), 'type': inlet_cfg.get('type')})
+            continue
+        inlets[key] = inlet_cfg
+    cfg_dict['inlets'] = inlets
+
+    processors = {}
+    for key, processor_cfg in cfg_dict.get('processors', {}).items():
+        if processor_cfg.get('type') in MODEL_PROCESSOR_TYPES:
+            skipped.append({'component': 'processor', 'name': processor_cfg.get('name'),
+                            'type': processor_cfg.get('type')})
+            continue
+        if processor_cfg.get('type') == 'save_on_disk':
+            processor_cfg['parameters'] = dict(processor_cfg.get('parameters') or {}, save_path=save_path)
+        processors[key] = processor_cfg
+    cfg_dict['processors'] = processors
+
+    return cfg_dict, skipped
+
+
+def build_inlets(config: PlantEyeConfiguration, width: int, height: int):
+    inlets = []
+    for inlet_config in config.get_inlet_configs():
+        if inlet_config.type in CAMERA_INLET_TYPES:
+            inlet = SyntheticCameraInlet(inlet_config, width, height)
+        elif inlet_config.type == 'static_variable':
+            inlet = StaticDataInlet(inlet_config)
+        else:
+            continue
+        inlet.apply_configuration()
+        inlets.append(inlet)
+    return inlets
+
+
+def build_shell(config: PlantEyeConfiguration):
+    shell_config = config.get_shell_config()
+    if shell_config.type == 'rest_api':
+        return RestAPIShell(shell_config)
+    elif shell_config.type == 'periodical_local':
+        return PeriodicalLocalShell(shell_config)
+    return None
+
+
+def latency_statistics(latencies: list):
+    latencies_ms = np.array(latencies, dtype=np.float64) * 1000
+    if len(latencies_ms) == 0:
+        return {}
+    return {'p50': round(float(np.percentile(latencies_ms, 50)), 3),
+            'p95': round(float(np.percentile(latencies_ms, 95)), 3),
+            'p99': round(float(np.percentile(latencies_ms, 99)), 3),
+            'mean': round(float(latencies_ms.mean()), 3),
+            'max': round(float(latencies_ms.max()), 3)}
+
+
+def run_benchmark(config_name: str, cfg_dict: dict, resolution: str, iterations: int, warmup: int,
+                  memory_iterations: int):
+    width, height = RESOLUTIONS[resolution]
+    run_result = {'config': config_name, 'resolution': resolution, 'width': width, 'height': height}
+
+    save_path = tempfile.mkdtemp(prefix='planteye_benchmark_')
+    try:
+        cfg_dict, skipped = prepare_config(cfg_dict, save_path)
+        run_result['skipped_components'] = skipped
+        if not any([inlet_cfg.get('type') in CAMERA_INLET_TYPES for inlet_cfg in cfg_dict['inlets'].values()]):
+            run_result['skipped'] = 'configuration has no camera inlet'
+            return run_result
+
+        config = PlantEyeConfiguration()
+        config.read(cfg_dict)
+        if not config.is_valid():
+            run_result['skipped'] = 'configuration is invalid'
+            return run_result
+
+        executor = PipeLineExecutor(config)
+        executor.shell = build_shell(config)
+        processors, process_pool = executor.configure_processors()
+        pipeline = Pipeline(build_inlets(config, width, height), processors, config.get_execution_config(),
+                            process_pool)
+        executor.swap_pipeline(pipeline)
+        try:
+            run_result.update(measure_pipeline(executor, pipeline, iterations, warmup, memory_iterations))
+        finally:
+            pipeline.release_resources()
+    finally:
+        shutil.rmtree(save_path, ignore_errors=True)
+
+    return run_result
+
+
+def measure_pipeline(executor: PipeLineExecutor, pipeline: Pipeline, iterations: int, warmup: int,
+                     memory_iterations: int):
+    for _ in range(warmup):
+        executor.single_execution()
+
+    # Latency pass
+    metrics.reset()
+    latencies = []
+    pass_begin = time.perf_counter()
+    for _ in range(iterations):
+        begin_time = time.perf_counter()
+        executor.single_execution()
+        latencies.append(time.perf_counter() - begin_time)
+    pass_duration = time.perf_counter() - pass_begin
+
+    stages = []
+    for stage_metrics in list(metrics.stages.values()):
+        stages.append({'stage': stage_metrics.stage, 'name': stage_metrics.name, 'type': stage_metrics.component_type,
+                       'calls': stage_metrics.calls, 'errors': stage_metrics.errors, 'bytes': stage_metrics.bytes,
+                       'latency_ms': latency_statistics(list(stage_metrics.latency.samples))})
+
+    # Memory passes, the pipeline as a whole and every processor on its own
+    tracemalloc.start()
+    try:
+        memory_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(memory_iterations):
+            executor.single_execution()
+        _, memory_peak = tracemalloc.get_traced_memory()
+        pipeline_peak_memory = memory_peak - memory_before
+
+        probes = {}
+        probe_lock = threading.Lock()
+        for processor in pipeline.processors:
+            probes[processor.name] = MemoryProbe(processor.execute, probe_lock)
+            processor.execute = probes[processor.name]
+        try:
+            for _ in range(memory_iterations):
+                executor.single_execution()
+        finally:
+            for processor in pipeline.processors:
+                del processor.execute
+    finally:
+        tracemalloc.stop()
+
+    for stage in stages:
+        if stage['stage'] == 'processor' and stage['name'] in probes:
+            stage['peak_memory_bytes'] = probes[stage['name']].peak_memory
+
+    pipeline_result = {'iterations': iterations,
+                       'fps': round(iterations / pass_duration, 3) if pass_duration > 0 else None,
+                       'latency_ms': latency_statistics(latencies),
+                       'peak_memory_bytes': pipeline_peak_memory}
+    logging.info(f'Benchmark finished: {pipeline_result}')
+    return {'pipeline': pipeline_result, 'stages': stages}
@@ -0,0 +1,92 @@
+import numpy as np
+
+from planteye_vision.inlet.inlet import Inlet
+from planteye_vision.common.frame_buffer_pool import FrameBufferPool
+from planteye_vision.common.timestamp import get_timestamp
+from planteye_vision.configuration.inlet_configuration import InletConfiguration
+from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage, DataChunkValue
+from planteye_vision.data_chunks.data_chunk_status import CapturingStatus, OPCUAReadStatus
+from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
+
+
+CAMERA_INLET_TYPES = ['local_camera_cv2', 'local_camera_cv2_video', 'baumer_camera_neoapi']
+
+
+class SyntheticCameraInlet(Inlet):
+    """
+    This class describes a camera inlet that provides synthetic frames of a given resolution.
+    It replaces capturing devices in benchmarks, every captured frame is written into a fresh or pooled buffer
+    as with a real device.
+    """
+    def __init__(self, config: InletConfiguration, width: int, height: int, seed: int = 0):
+        self.config = config
+        self.name = None
+        self.type = None
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.frame = None
+        self.frame_buffer_pool = None
+
+    def apply_configuration(self):
+        self.name = self.config.name
+        self.type = self.config.type
+        random_generator = np.random.default_rng(self.seed)
+        gradient = np.linspace(0, 255, self.width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+        noise = random_generator.normal(0, 16, (self.height, self.width, 3))
+        self.frame = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        frame_buffer_pool_size = self.config.parameters.get('frame_buffer_pool_size', 0)
+        self.frame_buffer_pool = FrameBufferPool(frame_buffer_pool_size) if frame_buffer_pool_size > 0 else None
+
+    def retrieve_data(self):
+        data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
+        data_chunk.add_metadata(MetadataChunkData('timestamp', get_timestamp()))
+        frame = self.capture_frame()
+        data_chunk.add_data(DataChunkImage('frame', frame, 'base64_png', shared=self.frame_buffer_pool is not None))
+        data_chunk.add_status(CapturingStatus(0))
+        data_chunk.add_metadata(MetadataChunkData('colormap', 'BGR'))
+        data_chunk.add_metadata(MetadataChunkData('shape', frame.shape))
+        for metadata_variable, metadata_value in self.config.metadata.items():
+            data_chunk.add_metadata(MetadataChunkData(metadata_variable, metadata_value))
+        return [data_chunk]
+
+    def capture_frame(self):
+        if self.frame_buffer_pool is None:
+            return self.frame.copy()
+        frame_buffer = self.frame_buffer_pool.acquire()
+        if frame_buffer is None:
+            frame_buffer = self.frame.copy()
+        else:
+            np.copyto(frame_buffer, self.frame)
+        self.frame_buffer_pool.retain(frame_buffer)
+        return frame_buffer
+
+    def execute(self):
+        return super().execute()
+
+
+class SyntheticOPCUAInlet(Inlet):
+    """
+    This class describes an OPC UA inlet that provides synthetic process values without any server.
+    """
+    def __init__(self, config: InletConfiguration, seed: int = 0):
+        self.config = config
+        self.name = None
+        self.type = None
+        self.random_generator = np.random.default_rng(seed)
+
+    def apply_configuration(self):
+        self.name = self.config.name
+        self.type = self.config.type
+
+    def retrieve_data(self):
+        data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
+        data_chunk.add_status(OPCUAReadStatus(0))
+        data_chunk.add_data(DataChunkValue('opcua_value', float(self.random_generator.random()), 'diverse'))
+        for metadata_variable, metadata_value in self.config.metadata.items():
+            data_chunk.add_metadata(MetadataChunkData(metadata_variable, metadata_value))
+        return [data_chunk]
+
+    def execute(self):
+        return super().execute()
@@ -7,10 +7,11 @@ logging.basicConfig(format='%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s
                     datefmt='%Y-%m-%d %H:%M:%S', level=logging.INFO)
 
 
-path_to_config_file = 'config_pt.yaml'
-with open(path_to_config_file) as config_file:
-    config_dict = safe_load(config_file)
+if __name__ == '__main__':
+    path_to_config_file = 'config_pt.yaml'
+    with open(path_to_config_file) as config_file:
+        config_dict = safe_load(config_file)
 
-config = PlantEyeConfiguration()
-config.read(config_dict)
-PipeLineExecutor(config).run()
+    config = PlantEyeConfiguration()
+    config.read(config_dict)
+    PipeLineExecutor(config).run()
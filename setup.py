@@ -27,5 +27,9 @@ setuptools.setup(
     license='MIT',
     author='Valentin Khaydarov',
     author_email='valentin.khaydarov@gmail.com',
-    description='PlantEye-Vision'
+    description='PlantEye-Vision',
+    extras_require={
+        # Production server of the REST API shell, the Flask development server is used without it
+        'production': ['waitress>=2.1'],
+    }
 )
@@ -0,0 +1,46 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EncodingPool:
+    """
+    This class encodes images on a pool of worker threads (image encoders release the interpreter lock).
+    Results are returned in the order of the images, at most lookahead encodings are ahead of the consumer,
+    so that a streamed response still holds only a bounded number of encoded frames.
+    """
+    def __init__(self, workers: int, lookahead: int = None):
+        self.workers = workers
+        self.lookahead = lookahead if lookahead is not None else workers
+        if workers > 1:
+            self.thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='encoder')
+        else:
+            self.thread_pool = None
+
+    def shutdown(self):
+        if self.thread_pool is not None:
+            self.thread_pool.shutdown(wait=False)
+
+    def map(self, function: callable, items):
+        if self.thread_pool is None:
+            for item in items:
+                yield function(item)
+            return
+
+        window = deque()
+        try:
+            for item in items:
+                window.append(self.thread_pool.submit(function, item))
+                if len(window) >= self.lookahead:
+                    yield window.popleft().result()
+            while len(window) > 0:
+                yield window.popleft().result()
+        finally:
+            # Consumer stopped early (e.g. client disconnected), encodings not started yet are dropped
+            for future in window:
+                future.cancel()
+
+
+def ordered_map(encoding_pool, function: callable, items):
+    if encoding_pool is None:
+        return map(function, items)
+    return encoding_pool.map(function, items)
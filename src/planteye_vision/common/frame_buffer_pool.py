@@ -0,0 +1,61 @@
+import threading
+import weakref
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """
+    This class describes a bounded pool of frame buffers, into which a capturing device writes its frames.
+    A buffer is leased when the device writes into it and is free again only once it is released explicitly, i.e.
+    after the result it was captured for is serialised and saved (see release_frame_buffers).
+    Images of pooled frames must be shared (read-only), so that processors copy the frame before they change it.
+    If no buffer is free, a new frame is allocated and kept in the pool only if the pool is not full yet, thus a
+    result that is never released costs an allocation per frame, but never a frame being overwritten.
+    """
+    pools = weakref.WeakSet()
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffers = []
+        self.leased = []
+        self.lock = threading.Lock()
+        FrameBufferPool.pools.add(self)
+
+    def acquire(self):
+        with self.lock:
+            for index, buffer in enumerate(self.buffers):
+                if not self.leased[index]:
+                    self.leased[index] = True
+                    return buffer
+        return None
+
+    def retain(self, frame: np.ndarray):
+        with self.lock:
+            if any([buffer is frame for buffer in self.buffers]):
+                return
+            # Buffers of another frame format (e.g. after the resolution was changed) are not reused any more
+            kept = [index for index, buffer in enumerate(self.buffers)
+                    if buffer.shape == frame.shape and buffer.dtype == frame.dtype]
+            self.buffers = [self.buffers[index] for index in kept]
+            self.leased = [self.leased[index] for index in kept]
+            if len(self.buffers) < self.size and frame.base is None and frame.flags.writeable:
+                self.buffers.append(frame)
+                self.leased.append(True)
+
+    def release(self, frames: list):
+        # A frame is either a pooled buffer itself or a view of it
+        with self.lock:
+            for index, buffer in enumerate(self.buffers):
+                if self.leased[index] and any([frame is buffer or frame.base is buffer for frame in frames]):
+                    self.leased[index] = False
+
+
+def release_frame_buffers(chunks: list):
+    # Every buffer is released once, even if several images of the chunks refer to it
+    frames = [chunk_data.value for chunk in chunks for chunk_data in getattr(chunk, 'data', [])
+              if isinstance(getattr(chunk_data, 'value', None), np.ndarray)]
+    if len(frames) == 0:
+        return
+    for pool in list(FrameBufferPool.pools):
+        pool.release(frames)
@@ -0,0 +1,130 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class LatencyWindow:
+    """
+    This class describes a rolling window of the latest execution latencies (in seconds).
+    Quantiles are computed over the window, sum and count over the whole lifetime.
+    """
+    def __init__(self, window_size: int):
+        self.samples = deque(maxlen=window_size)
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, latency: float):
+        self.samples.append(latency)
+        self.sum += latency
+        self.count += 1
+
+    def quantile(self, q: float):
+        if len(self.samples) == 0:
+            return float('nan')
+        ordered_samples = sorted(self.samples)
+        index = min(int(round(q * (len(ordered_samples) - 1))), len(ordered_samples) - 1)
+        return ordered_samples[index]
+
+
+class StageMetrics:
+    """
+    This class describes the metrics of one stage (inlet, processor or encoder): latencies, calls, errors and bytes.
+    """
+    def __init__(self, stage: str, name: str, component_type: str, window_size: int):
+        self.stage = stage
+        self.name = name
+        self.component_type = component_type
+        self.latency = LatencyWindow(window_size)
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+
+    def labels(self):
+        return f'stage="{_escape(self.stage)}",name="{_escape(self.name)}",type="{_escape(self.component_type)}"'
+
+
+class MetricsRegistry:
+    """
+    This class describes a thread-safe registry of stage metrics that can be exported in Prometheus text format.
+    """
+    QUANTILES = [0.5, 0.95, 0.99]
+
+    def __init__(self, window_size: int = 1024):
+        self.window_size = window_size
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage: str, name: str, component_type: str, duration: float, error: bool = False,
+               nbytes: int = 0):
+        key = (stage, name, component_type)
+        with self.lock:
+            stage_metrics = self.stages.get(key)
+            if stage_metrics is None:
+                stage_metrics = StageMetrics(stage, name, component_type, self.window_size)
+                self.stages[key] = stage_metrics
+            stage_metrics.latency.add(duration)
+            stage_metrics.calls += 1
+            stage_metrics.bytes += nbytes
+            if error:
+                stage_metrics.errors += 1
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+
+    def as_prometheus(self):
+        with self.lock:
+            rows = [(stage_metrics.labels(), [stage_metrics.latency.quantile(q) for q in self.QUANTILES],
+                     stage_metrics.latency.sum, stage_metrics.latency.count, stage_metrics.calls,
+                     stage_metrics.errors, stage_metrics.bytes) for stage_metrics in self.stages.values()]
+
+        lines = ['# HELP planteye_stage_latency_seconds Execution latency of pipeline stages',
+                 '# TYPE planteye_stage_latency_seconds summary']
+        for labels, quantiles, latency_sum, latency_count, _, _, _ in rows:
+            for q, value in zip(self.QUANTILES, quantiles):
+                lines.append(f'planteye_stage_latency_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+            lines.append(f'planteye_stage_latency_seconds_sum{{{labels}}} {latency_sum:.6f}')
+            lines.append(f'planteye_stage_latency_seconds_count{{{labels}}} {latency_count}')
+
+        counters = [('calls', 'Number of executions of pipeline stages', 4),
+                    ('errors', 'Number of failed executions of pipeline stages', 5),
+                    ('bytes', 'Number of data bytes handled by pipeline stages', 6)]
+        for counter_name, counter_help, index in counters:
+            lines.append(f'# HELP planteye_stage_{counter_name}_total {counter_help}')
+            lines.append(f'# TYPE planteye_stage_{counter_name}_total counter')
+            for row in rows:
+                lines.append(f'planteye_stage_{counter_name}_total{{{row[0]}}} {row[index]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def chunks_nbytes(chunks):
+    if not isinstance(chunks, list):
+        return 0
+    nbytes = 0
+    for chunk in chunks:
+        for chunk_data in getattr(chunk, 'data', []):
+            value = getattr(chunk_data, 'value', None)
+            if isinstance(value, np.ndarray):
+                nbytes += value.nbytes
+            elif isinstance(value, (str, bytes)):
+                nbytes += len(value)
+    return nbytes
+
+
+def chunks_have_errors(chunks, operation_type: str = None, excluded_chunks=()):
+    # Statuses of other operations and excluded (e.g. passed through) chunks are not counted
+    if not isinstance(chunks, list):
+        return False
+    excluded_ids = set([id(chunk) for chunk in excluded_chunks])
+    return any([status.code != 0 for chunk in chunks if id(chunk) not in excluded_ids
+                for status in getattr(chunk, 'status', [])
+                if operation_type is None or status.operation_type == operation_type])
+
+
+def _escape(label_value):
+    return str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,33 @@
+class ConfigurationDiff:
+    """
+    This class describes the differences between the previous and the updated configurations of components.
+    Components are identified by their names, a component with a different type is considered as removed and added.
+    """
+    def __init__(self, previous_configs: list, updated_configs: list):
+        self.unchanged = []
+        self.changed = []
+        self.added = []
+        self.removed = []
+
+        previous_configs_by_name = {config.name: config for config in previous_configs}
+        updated_names = [config.name for config in updated_configs]
+        for config in updated_configs:
+            previous_config = previous_configs_by_name.get(config.name)
+            if previous_config is None or previous_config.type != config.type:
+                self.added.append(config.name)
+            elif previous_config.cfg_dict == config.cfg_dict:
+                self.unchanged.append(config.name)
+            else:
+                self.changed.append(config.name)
+        for name, config in previous_configs_by_name.items():
+            if name not in updated_names or config.type != updated_configs[updated_names.index(name)].type:
+                self.removed.append(name)
+
+    def is_unchanged(self, name: str):
+        return name in self.unchanged
+
+    def is_changed(self, name: str):
+        return name in self.changed
+
+    def as_dict(self):
+        return {'unchanged': self.unchanged, 'changed': self.changed, 'added': self.added, 'removed': self.removed}
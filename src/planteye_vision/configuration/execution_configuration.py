@@ -0,0 +1,32 @@
+import os
+
+from planteye_vision.configuration.configuration import Configuration
+
+
+class ExecutionConfiguration(Configuration):
+    def __init__(self):
+        self.parameters = {'processor_workers': os.cpu_count() or 1, 'process_workers': os.cpu_count() or 1,
+                           'cache_memory_limit': 256}
+        self.cfg_dict = {}
+        self.valid = True
+
+    def read(self, cfg_dict: dict):
+        self.cfg_dict = cfg_dict
+        if 'processor_workers' in self.cfg_dict.keys():
+            if isinstance(self.cfg_dict['processor_workers'], int) and self.cfg_dict['processor_workers'] > 0:
+                self.parameters['processor_workers'] = self.cfg_dict['processor_workers']
+            else:
+                self.valid = False
+        if 'process_workers' in self.cfg_dict.keys():
+            if isinstance(self.cfg_dict['process_workers'], int) and self.cfg_dict['process_workers'] > 0:
+                self.parameters['process_workers'] = self.cfg_dict['process_workers']
+            else:
+                self.valid = False
+        if 'cache_memory_limit' in self.cfg_dict.keys():
+            if isinstance(self.cfg_dict['cache_memory_limit'], (int, float)) and self.cfg_dict['cache_memory_limit'] >= 0:
+                self.parameters['cache_memory_limit'] = self.cfg_dict['cache_memory_limit']
+            else:
+                self.valid = False
+
+    def is_valid(self):
+        return self.valid
@@ -0,0 +1,36 @@
+from planteye_vision.configuration.configuration import Configuration
+from planteye_vision.data_chunks.data_chunk_data import IMAGE_FORMATS
+
+
+class ImageEncodingConfiguration(Configuration):
+    """
+    This class describes the encoding of image frames written by a shell or a processor.
+    The level is the compression level (0-9) for png and the quality (0-100) for jpeg and webp,
+    None stands for the default of the codec.
+    """
+    def __init__(self, image_format: str = 'png'):
+        self.cfg_dict = {}
+        self.image_format = image_format
+        self.level = None
+        self.valid = True
+
+    def read(self, cfg_dict: dict):
+        self.cfg_dict = cfg_dict
+        if not isinstance(self.cfg_dict, dict):
+            self.valid = False
+            return
+        if 'format' in self.cfg_dict.keys():
+            self.image_format = self.cfg_dict['format']
+            if self.image_format not in IMAGE_FORMATS:
+                self.valid = False
+        if self.image_format == 'png' and 'compression' in self.cfg_dict.keys():
+            self.level = self.cfg_dict['compression']
+            if not isinstance(self.level, int) or not 0 <= self.level <= 9:
+                self.valid = False
+        if self.image_format in ['jpeg', 'webp'] and 'quality' in self.cfg_dict.keys():
+            self.level = self.cfg_dict['quality']
+            if not isinstance(self.level, int) or not 0 <= self.level <= 100:
+                self.valid = False
+
+    def is_valid(self):
+        return self.valid
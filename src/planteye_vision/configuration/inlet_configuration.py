@@ -4,9 +4,14 @@ from planteye_vision.configuration.configuration import ComponentConfiguration
 class InletConfiguration(ComponentConfiguration):
     def __init__(self):
         super().__init__()
+        self.timeout = None
 
     def read(self, cfg_dict: dict):
         super().read(cfg_dict)
+        if 'timeout' in self.cfg_dict.keys():
+            self.timeout = self.cfg_dict['timeout']
+            if isinstance(self.timeout, bool) or not isinstance(self.timeout, (int, float)) or self.timeout <= 0:
+                self.valid = False
 
 
 class CameraConfiguration(InletConfiguration):
@@ -19,6 +24,11 @@ class CameraConfiguration(InletConfiguration):
         if 'parameters' in self.cfg_dict.keys():
             if 'device_id' in self.cfg_dict['parameters']:
                 self.parameters['device_id'] = self.cfg_dict['parameters']['device_id']
+            if 'frame_buffer_pool_size' in self.cfg_dict['parameters']:
+                self.parameters['frame_buffer_pool_size'] = self.cfg_dict['parameters']['frame_buffer_pool_size']
+                if not isinstance(self.parameters['frame_buffer_pool_size'], int) \
+                        or self.parameters['frame_buffer_pool_size'] < 0:
+                    self.valid = False
 
 
 class VideoCameraConfiguration(CameraConfiguration):
@@ -89,5 +99,11 @@ class RestAPIInletConfiguration(InletConfiguration):
                 self.parameters['endpoint'] = self.cfg_dict['parameters']['endpoint']
             else:
                 self.valid = False
+            if 'image_format' in self.cfg_dict['parameters']:
+                self.parameters['image_format'] = self.cfg_dict['parameters']['image_format']
+                if self.parameters['image_format'] not in ['png', 'jpeg', 'webp', 'raw']:
+                    self.valid = False
+            else:
+                self.parameters['image_format'] = 'png'
         else:
             self.valid = False
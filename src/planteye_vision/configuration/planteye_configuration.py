@@ -2,6 +2,8 @@ from planteye_vision.configuration.configuration import Configuration
 from planteye_vision.configuration.shell_configuration import *
 from planteye_vision.configuration.inlet_configuration import *
 from planteye_vision.configuration.processor_configuration import *
+from planteye_vision.configuration.execution_configuration import ExecutionConfiguration
+from planteye_vision.configuration.configuration_diff import ConfigurationDiff
 import logging
 
 
@@ -12,6 +14,9 @@ class PlantEyeConfiguration(Configuration):
         self.shell = None
         self.inlets = []
         self.processors = []
+        self.execution = ExecutionConfiguration()
+        self.inlets_diff = None
+        self.processors_diff = None
         self.cfg_dict = {}
         self.configured_once = False
         self.valid_structure = True
@@ -22,6 +27,7 @@ class PlantEyeConfiguration(Configuration):
         self.shell = None
         self.inlets = []
         self.processors = []
+        self.execution = ExecutionConfiguration()
 
         if not isinstance(cfg_dict, dict):
             self.valid_structure = False
@@ -46,12 +52,37 @@ class PlantEyeConfiguration(Configuration):
             processors_cfg_list = list(self.cfg_dict['processors'].values())
             self.processors = self._read_processor_configs(processors_cfg_list)
 
+        if 'execution' in self.cfg_dict.keys():
+            self.execution.read(self.cfg_dict['execution'])
+
         self.ongoing_config = False
         self.configured_once = True
 
+    def updated(self, cfg_dict):
+        # The update is applied to a copy, so that this configuration stays unchanged if the update is invalid
+        config = PlantEyeConfiguration()
+        config.type = self.type
+        config.name = self.name
+        config.shell = self.shell
+        config.inlets = self.inlets
+        config.processors = self.processors
+        config.execution = self.execution
+        config.cfg_dict = self.cfg_dict
+        config.configured_once = self.configured_once
+        config.valid_structure = self.valid_structure
+        config.update(cfg_dict)
+        return config
+
     def update(self, cfg_dict):
         self.ongoing_config = True
+        if not isinstance(cfg_dict, dict):
+            self.valid_structure = False
+            logging.error('Configuration update has invalid structure')
+            self.ongoing_config = False
+            return
         self.cfg_dict = cfg_dict
+        previous_inlets = self.inlets
+        previous_processors = self.processors
         if 'inlets' in cfg_dict.keys():
             if len(cfg_dict['inlets']) > 0:
                 inlets_cfg_list = list(cfg_dict['inlets'].values())
@@ -66,8 +97,25 @@ class PlantEyeConfiguration(Configuration):
             else:
                 self.processors = []
 
+        self.inlets_diff = ConfigurationDiff(previous_inlets, self.inlets)
+        self.inlets = self._keep_unchanged_configs(previous_inlets, self.inlets, self.inlets_diff)
+        self.processors_diff = ConfigurationDiff(previous_processors, self.processors)
+        self.processors = self._keep_unchanged_configs(previous_processors, self.processors, self.processors_diff)
+        logging.info(f'Inlets configuration diff: {self.inlets_diff.as_dict()}')
+        logging.info(f'Processors configuration diff: {self.processors_diff.as_dict()}')
+
+        if 'execution' in cfg_dict.keys():
+            self.execution = ExecutionConfiguration()
+            self.execution.read(cfg_dict['execution'])
+
         self.ongoing_config = True
 
+    @staticmethod
+    def _keep_unchanged_configs(previous_configs: list, updated_configs: list, diff: ConfigurationDiff):
+        previous_configs_by_name = {config.name: config for config in previous_configs}
+        return [previous_configs_by_name[config.name] if diff.is_unchanged(config.name) else config
+                for config in updated_configs]
+
     @staticmethod
     def _read_shell_config(shell_cfg_dict):
         logging.debug('Shell configuration import...')
@@ -143,6 +191,10 @@ class PlantEyeConfiguration(Configuration):
                 logging.error('Shell configuration invalid')
                 return False
 
+        if not self.execution.is_valid():
+            logging.error('Execution configuration invalid')
+            return False
+
         if len(self.inlets) > 0:
             for inlet in self.inlets:
                 if not inlet.is_valid():
@@ -154,9 +206,18 @@ class PlantEyeConfiguration(Configuration):
                 if not processor.is_valid():
                     logging.error(f'Processor {processor.name}: configuration invalid')
                     return False
+            if not self._processor_graph_is_valid():
+                return False
 
         return True
 
+    def _processor_graph_is_valid(self):
+        # Only processors linked as graph are validated, as a linear chain they are not linked by name
+        if not any([processor.inputs is not None for processor in self.processors]):
+            return True
+        from planteye_vision.pipeline_execution.processor_graph import ProcessorGraph
+        return ProcessorGraph.validate(self.processors, [inlet.name for inlet in self.inlets])
+
     def get_shell_config(self):
         return self.shell
 
@@ -165,3 +226,6 @@ class PlantEyeConfiguration(Configuration):
 
     def get_processor_configs(self):
         return self.processors
+
+    def get_execution_config(self):
+        return self.execution
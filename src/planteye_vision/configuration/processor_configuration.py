@@ -1,13 +1,26 @@
 from planteye_vision.configuration.configuration import ComponentConfiguration
+from planteye_vision.configuration.image_encoding_configuration import ImageEncodingConfiguration
 
 
 class ProcessorConfiguration(ComponentConfiguration):
     def __init__(self):
         super().__init__()
         self.seq_id = 0
+        self.inputs = None
+        self.run_in_process = False
+        self.cache = False
 
     def read(self, cfg_dict: dict):
         super().read(cfg_dict)
+        if 'inputs' in self.cfg_dict.keys():
+            if isinstance(self.cfg_dict['inputs'], list):
+                self.inputs = self.cfg_dict['inputs']
+            else:
+                self.valid = False
+        if 'run_in_process' in self.cfg_dict.keys():
+            self.run_in_process = bool(self.cfg_dict['run_in_process'])
+        if 'cache' in self.cfg_dict.keys():
+            self.cache = bool(self.cfg_dict['cache'])
 
 
 class PTModelInferenceProcessorConfiguration(ProcessorConfiguration):
@@ -156,9 +169,14 @@ class SaveOnDiskProcessorConfiguration(ProcessorConfiguration):
     def __init__(self):
         super().__init__()
         self.parameters['save_path'] = '../data/'
+        self.image_encoding = ImageEncodingConfiguration()
 
     def read(self, cfg_dict: dict):
         super().read(cfg_dict)
         if 'parameters' in self.cfg_dict.keys():
             if 'save_path' in self.cfg_dict['parameters']:
                 self.parameters['save_path'] = self.cfg_dict['parameters']['save_path']
+            if 'image_encoding' in self.cfg_dict['parameters']:
+                self.image_encoding.read(self.cfg_dict['parameters']['image_encoding'])
+                if not self.image_encoding.is_valid():
+                    self.valid = False
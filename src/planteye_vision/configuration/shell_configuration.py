@@ -1,4 +1,7 @@
+import os
+
 from planteye_vision.configuration.configuration import ComponentConfiguration
+from planteye_vision.configuration.image_encoding_configuration import ImageEncodingConfiguration
 
 
 class ShellConfiguration(ComponentConfiguration):
@@ -12,19 +15,43 @@ class ShellConfiguration(ComponentConfiguration):
 class PeriodicalLocalShellConfiguration(ShellConfiguration):
     def __init__(self):
         super().__init__()
-        self.parameters = {'time_interval': 1000}
+        self.parameters = {'time_interval': 1000, 'pipeline_mode': 'sequential', 'queue_size': 1,
+                           'queue_policy': 'drop_oldest'}
 
     def read(self, cfg_dict: dict):
         super().read(cfg_dict)
         if 'parameters' in self.cfg_dict.keys():
             if 'time_interval' in self.cfg_dict['parameters']:
                 self.parameters['time_interval'] = self.cfg_dict['parameters']['time_interval']
+            if 'pipeline_mode' in self.cfg_dict['parameters']:
+                self.parameters['pipeline_mode'] = self.cfg_dict['parameters']['pipeline_mode']
+                if self.parameters['pipeline_mode'] not in ['sequential', 'staged']:
+                    self.valid = False
+            else:
+                self.parameters['pipeline_mode'] = 'sequential'
+            if 'queue_size' in self.cfg_dict['parameters']:
+                self.parameters['queue_size'] = self.cfg_dict['parameters']['queue_size']
+                if not isinstance(self.parameters['queue_size'], int) or self.parameters['queue_size'] < 1:
+                    self.valid = False
+            else:
+                self.parameters['queue_size'] = 1
+            if 'queue_policy' in self.cfg_dict['parameters']:
+                self.parameters['queue_policy'] = self.cfg_dict['parameters']['queue_policy']
+                if self.parameters['queue_policy'] not in ['drop_oldest', 'block']:
+                    self.valid = False
+            else:
+                self.parameters['queue_policy'] = 'drop_oldest'
 
 
 class RestAPIShellConfiguration(ShellConfiguration):
     def __init__(self):
         super().__init__()
-        self.parameters = {'host': '0.0.0.0', 'port': 5000, 'endpoint': '/get_frame'}
+        self.parameters = {'host': '0.0.0.0', 'port': 5000, 'endpoint': '/get_frame', 'freshness_window': 0,
+                           'streaming': True, 'encoding_workers': os.cpu_count() or 1, 'server': 'development',
+                           'threads': 8, 'connection_limit': 100, 'backlog': 1024, 'channel_timeout': 120,
+                           'stream_fps': 10, 'stream_chunk': None, 'events_queue_size': 4, 'mode': 'on_request',
+                           'time_interval': 1000}
+        self.image_encoding = ImageEncodingConfiguration()
 
     def read(self, cfg_dict: dict):
         super().read(cfg_dict)
@@ -35,3 +62,67 @@ class RestAPIShellConfiguration(ShellConfiguration):
                 self.parameters['port'] = self.cfg_dict['parameters']['port']
             if 'endpoint' in self.cfg_dict['parameters']:
                 self.parameters['endpoint'] = self.cfg_dict['parameters']['endpoint']
+            if 'freshness_window' in self.cfg_dict['parameters']:
+                self.parameters['freshness_window'] = self.cfg_dict['parameters']['freshness_window']
+                if not isinstance(self.parameters['freshness_window'], (int, float)):
+                    self.valid = False
+            else:
+                self.parameters['freshness_window'] = 0
+            if 'streaming' in self.cfg_dict['parameters']:
+                self.parameters['streaming'] = self.cfg_dict['parameters']['streaming']
+                if not isinstance(self.parameters['streaming'], bool):
+                    self.valid = False
+            else:
+                self.parameters['streaming'] = True
+            if 'encoding_workers' in self.cfg_dict['parameters']:
+                self.parameters['encoding_workers'] = self.cfg_dict['parameters']['encoding_workers']
+                if not isinstance(self.parameters['encoding_workers'], int) or self.parameters['encoding_workers'] < 1:
+                    self.valid = False
+            else:
+                self.parameters['encoding_workers'] = os.cpu_count() or 1
+            if 'image_encoding' in self.cfg_dict['parameters']:
+                self.image_encoding.read(self.cfg_dict['parameters']['image_encoding'])
+                if not self.image_encoding.is_valid():
+                    self.valid = False
+            if 'server' in self.cfg_dict['parameters']:
+                self.parameters['server'] = self.cfg_dict['parameters']['server']
+                if self.parameters['server'] not in ['development', 'production']:
+                    self.valid = False
+            else:
+                self.parameters['server'] = 'development'
+            for parameter, default_value in [('threads', 8), ('connection_limit', 100), ('backlog', 1024),
+                                             ('channel_timeout', 120)]:
+                if parameter in self.cfg_dict['parameters']:
+                    self.parameters[parameter] = self.cfg_dict['parameters'][parameter]
+                    if not isinstance(self.parameters[parameter], int) or self.parameters[parameter] < 1:
+                        self.valid = False
+                else:
+                    self.parameters[parameter] = default_value
+            if 'stream_fps' in self.cfg_dict['parameters']:
+                self.parameters['stream_fps'] = self.cfg_dict['parameters']['stream_fps']
+                if not isinstance(self.parameters['stream_fps'], (int, float)) or self.parameters['stream_fps'] <= 0:
+                    self.valid = False
+            else:
+                self.parameters['stream_fps'] = 10
+            if 'stream_chunk' not in self.cfg_dict['parameters']:
+                self.parameters['stream_chunk'] = None
+            if 'events_queue_size' in self.cfg_dict['parameters']:
+                self.parameters['events_queue_size'] = self.cfg_dict['parameters']['events_queue_size']
+                if not isinstance(self.parameters['events_queue_size'], int) \
+                        or self.parameters['events_queue_size'] < 1:
+                    self.valid = False
+            else:
+                self.parameters['events_queue_size'] = 4
+            if 'mode' in self.cfg_dict['parameters']:
+                self.parameters['mode'] = self.cfg_dict['parameters']['mode']
+                if self.parameters['mode'] not in ['on_request', 'background']:
+                    self.valid = False
+            else:
+                self.parameters['mode'] = 'on_request'
+            if 'time_interval' in self.cfg_dict['parameters']:
+                self.parameters['time_interval'] = self.cfg_dict['parameters']['time_interval']
+                if not isinstance(self.parameters['time_interval'], (int, float)) \
+                        or self.parameters['time_interval'] <= 0:
+                    self.valid = False
+            else:
+                self.parameters['time_interval'] = 1000
@@ -5,6 +5,8 @@ from planteye_vision.data_chunks.data_chunk_status import DataChunkStatus
 
 
 class DataChunk(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def add_data(self, data: DataChunkData):
         pass
@@ -23,6 +25,8 @@ class DataChunk(ABC):
 
 
 class GeneralDataChunk(DataChunk):
+    __slots__ = ('name', 'chunk_type', 'hidden', 'parameters', 'data', 'metadata', 'status')
+
     def __init__(self, name: str, chunk_type: str, parameters: dict, hidden: bool = False):
         self.name = name
         self.chunk_type = chunk_type
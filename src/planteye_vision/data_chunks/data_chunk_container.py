@@ -0,0 +1,56 @@
+import json
+import struct
+
+
+CONTAINER_MEDIA_TYPE = 'application/vnd.planteye.container'
+CONTAINER_MAGIC = b'PEVC'
+CONTAINER_VERSION = 1
+
+HEADER_LENGTH = struct.Struct('>I')
+BUFFER_LENGTH = struct.Struct('>Q')
+
+
+def pack_container(header: dict, buffers: list):
+    """
+    Packs a JSON header and binary buffers into a length-prefixed container:
+    magic (4 bytes), header length (u32), header (JSON, utf-8), then every buffer as length (u64) and bytes.
+    """
+    return b''.join(iterate_container(header, buffers))
+
+
+def iterate_container(header: dict, buffers):
+    """
+    Yields the parts of a container one after another, buffers might be given as an iterator to create them lazily.
+    """
+    header_bytes = json.dumps(header).encode('utf-8')
+    yield CONTAINER_MAGIC + HEADER_LENGTH.pack(len(header_bytes)) + header_bytes
+    for buffer in buffers:
+        yield BUFFER_LENGTH.pack(len(buffer))
+        yield buffer
+
+
+def unpack_container(payload):
+    """
+    Unpacks a container into its header and buffers. Buffers are returned as memoryviews of the payload.
+    """
+    view = memoryview(payload)
+    if bytes(view[:len(CONTAINER_MAGIC)]) != CONTAINER_MAGIC:
+        raise ValueError('Payload is not a PlantEye container')
+    offset = len(CONTAINER_MAGIC)
+    header_length, = HEADER_LENGTH.unpack_from(view, offset)
+    offset += HEADER_LENGTH.size
+    header = json.loads(bytes(view[offset:offset + header_length]).decode('utf-8'))
+    offset += header_length
+
+    buffers = []
+    while offset < len(view):
+        buffer_length, = BUFFER_LENGTH.unpack_from(view, offset)
+        offset += BUFFER_LENGTH.size
+        if offset + buffer_length > len(view):
+            raise ValueError('PlantEye container is truncated')
+        buffers.append(view[offset:offset + buffer_length])
+        offset += buffer_length
+
+    if len(buffers) != header.get('buffers', len(buffers)):
+        raise ValueError('PlantEye container has an unexpected number of buffers')
+    return header, buffers
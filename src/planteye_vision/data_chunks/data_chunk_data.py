@@ -4,13 +4,27 @@ import cv2
 import base64
 
 
+IMAGE_FORMATS = ['png', 'jpeg', 'webp', 'raw']
+
+# File extension and level parameter (compression or quality) of the OpenCV codec of every compressed format
+IMAGE_CODECS = {
+    'png': ('.png', cv2.IMWRITE_PNG_COMPRESSION),
+    'jpeg': ('.jpg', cv2.IMWRITE_JPEG_QUALITY),
+    'webp': ('.webp', cv2.IMWRITE_WEBP_QUALITY),
+}
+
+
 class DataChunkData(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def as_dict(self):
         pass
 
 
 class DataChunkValue(DataChunkData):
+    __slots__ = ('name', 'value', 'data_type')
+
     def __init__(self, name: str, value, data_type: str):
         self.name = name
         self.value = value
@@ -21,21 +35,87 @@ class DataChunkValue(DataChunkData):
 
 
 class DataChunkImage(DataChunkData):
-    def __init__(self, name: str, value, data_type: str):
+    """
+    This class describes an image frame that might share its buffer with other images (copy-on-write).
+    Views and shared references are read-only, a writable frame is obtained via mutable_value(), which copies
+    the frame if its buffer is shared. Encodings (png, jpeg, webp, raw and their base64 form) are computed lazily and
+    memoised next to the frame, so all consumers share one encoding; the frame itself is never replaced.
+    """
+    __slots__ = ('name', 'value', 'data_type', 'shared', 'encodings')
+
+    def __init__(self, name: str, value, data_type: str, shared: bool = False):
         self.name = name
+        self.shared = shared
+        self.encodings = {}
         if isinstance(value, np.ndarray):
+            if shared:
+                value = value.view()
+                value.flags.writeable = False
             self.value = value
         elif isinstance(value, str):
             self.value = self.base64_decoder(value)
+            image_format = data_type[len('base64_'):] if data_type.startswith('base64_') else None
+            if image_format in IMAGE_CODECS:
+                self.encodings[('base64', image_format, None)] = value
+        else:
+            self.value = value
         self.data_type = data_type
 
     def as_dict(self):
         return {'name': self.name, 'value': self.value, 'type': self.data_type}
 
-    def encode_as_base64(self):
-        if isinstance(self.value, np.ndarray):
-            _, frame_arr = cv2.imencode('.png', self.value)
-            self.value = base64.b64encode(frame_arr).decode("utf-8")
+    def view(self, region: tuple, name: str = None, data_type: str = None):
+        self.shared = True
+        return DataChunkImage(name or self.name, self.value[region], data_type or self.data_type, shared=True)
+
+    def share(self, name: str = None, data_type: str = None):
+        return self.view((Ellipsis,), name, data_type)
+
+    def mutable_value(self):
+        if isinstance(self.value, np.ndarray) and (self.shared or not self.value.flags.writeable):
+            self.value = self.value.copy()
+            self.shared = False
+        self.encodings = {}
+        return self.value
+
+    def encode(self, image_format: str = 'png', level: int = None, memoise: bool = True):
+        # level is the png compression level or the jpeg/webp quality, None for the default of the codec
+        key = (image_format, level)
+        encoded = self.encodings.get(key)
+        if encoded is None:
+            base64_encoded = self.encodings.get(('base64', image_format, level))
+            if base64_encoded is not None:
+                encoded = base64.b64decode(base64_encoded)
+            elif image_format == 'raw':
+                encoded = np.ascontiguousarray(self.value).tobytes()
+            elif image_format in IMAGE_CODECS:
+                extension, level_parameter = IMAGE_CODECS[image_format]
+                parameters = [] if level is None else [level_parameter, int(level)]
+                _, frame_arr = cv2.imencode(extension, self.value, parameters)
+                encoded = frame_arr.tobytes()
+            else:
+                raise ValueError(f'Unsupported image format {image_format}')
+            if memoise:
+                self.encodings[key] = encoded
+        return encoded
+
+    def encode_as_base64(self, image_format: str = 'png', level: int = None, memoise: bool = True):
+        if not isinstance(self.value, np.ndarray):
+            return None
+        key = ('base64', image_format, level)
+        encoded = self.encodings.get(key)
+        if encoded is None:
+            encoded = base64.b64encode(self.encode(image_format, level, memoise)).decode("utf-8")
+            if memoise:
+                self.encodings[key] = encoded
+        return encoded
+
+    @classmethod
+    def from_encoded(cls, name: str, encoded: bytes, image_format: str, data_type: str):
+        image_array = np.frombuffer(encoded, dtype=np.uint8)
+        image = cls(name, cv2.imdecode(image_array, cv2.IMREAD_UNCHANGED), data_type)
+        image.encodings[(image_format, None)] = bytes(encoded)
+        return image
 
     @staticmethod
     def base64_decoder(frame: str):
@@ -1,100 +1,95 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 
 
 class DataChunkStatus(ABC):
-    @abstractmethod
-    def as_dict(self):
+    """
+    This class describes a status of an operation. Statuses are immutable, one shared instance exists per class and
+    code, its message is looked up once in the message table of the class.
+    """
+    __slots__ = ('code', 'message')
+    operation = 'Unknown operation'
+    operation_type = 'unknown'
+    messages = {}
+    _instances = {}
+
+    def __new__(cls, code: int):
+        status = DataChunkStatus._instances.get((cls, code))
+        if status is None:
+            status = super().__new__(cls)
+            status.code = code
+            status.message = cls.messages.get(code, 'Unknown state')
+            status = DataChunkStatus._instances.setdefault((cls, code), status)
+        return status
+
+    def __init__(self, code: int):
         pass
 
+    def __reduce__(self):
+        return self.__class__, (self.code,)
 
-class CapturingStatus(DataChunkStatus):
-    def __init__(self, code: int):
-        self.operation = 'Frame capturing'
-        self.operation_type = 'image_capturing'
-        self.code = code
-        self.message = 'Unknown state'
-        self.infer_message()
-
-    def infer_message(self):
-        if self.code == 0:
-            self.message = 'Frame captured'
-        elif self.code == 1:
-            self.message = 'Frame NOT captured: capturing device is NOT initialised yet'
-        elif self.code == 2:
-            self.message = 'Frame NOT captured: capturing device is busy'
-        elif self.code == 99:
-            self.message = 'Frame NOT captured: unknown error'
-        elif self.code == 100:
-            self.message = 'Invalid configuration'
+    def get_message(self):
+        return self.message
 
     def as_dict(self):
         return {self.operation: {'type': self.operation_type, 'code': self.code, 'message': self.message}}
 
-    def get_message(self):
-        return self.message
+
+class CapturingStatus(DataChunkStatus):
+    __slots__ = ()
+    operation = 'Frame capturing'
+    operation_type = 'image_capturing'
+    messages = {
+        0: 'Frame captured',
+        1: 'Frame NOT captured: capturing device is NOT initialised yet',
+        2: 'Frame NOT captured: capturing device is busy',
+        99: 'Frame NOT captured: unknown error',
+        100: 'Invalid configuration',
+    }
 
 
 class ProcessorStatus(DataChunkStatus):
-    def __init__(self, code: int):
-        self.operation = 'Processor'
-        self.operation_type = 'processor'
-        self.code = code
-        self.message = 'Unknown state'
-        self.infer_message()
-
-    def infer_message(self):
-        if self.code == 0:
-            self.message = 'Processing value successful'
-        elif self.code == 99:
-            self.message = 'Value NOT processes: unknown error'
-        elif self.code == 100:
-            self.message = 'Invalid configuration'
+    __slots__ = ()
+    operation = 'Processor'
+    operation_type = 'processor'
+    messages = {
+        0: 'Processing value successful',
+        99: 'Value NOT processes: unknown error',
+        100: 'Invalid configuration',
+    }
 
-    def as_dict(self):
-        return {self.operation: {'type': self.operation_type, 'code': self.code, 'message': self.message}}
-    
 
 class OPCUAReadStatus(DataChunkStatus):
-    def __init__(self, code: int):
-        self.operation = 'Reading process value over OPC UA'
-        self.operation_type = 'opcua_poll'
-        self.code = code
-        self.message = 'Unknown state'
-        self.infer_message()
-
-    def infer_message(self):
-        if self.code == 0:
-            self.message = 'Process value read'
-        elif self.code == 1:
-            self.message = 'Process value NOT read: error 1'
-        elif self.code == 2:
-            self.message = 'Process value NOT read: error 2'
-        elif self.code == 99:
-            self.message = 'Process value NOT read: unknown error'
-        elif self.code == 100:
-            self.message = 'Invalid configuration'
-
-    def as_dict(self):
-        return {self.operation: {'type': self.operation_type, 'code': self.code, 'message': self.message}}
+    __slots__ = ()
+    operation = 'Reading process value over OPC UA'
+    operation_type = 'opcua_poll'
+    messages = {
+        0: 'Process value read',
+        1: 'Process value NOT read: error 1',
+        2: 'Process value NOT read: error 2',
+        99: 'Process value NOT read: unknown error',
+        100: 'Invalid configuration',
+    }
 
 
 class RestAPIReadStatus(DataChunkStatus):
-    def __init__(self, code: int):
-        self.operation = 'Reading data over Rest API'
-        self.operation_type = 'restapi_read'
-        self.code = code
-        self.message = 'Unknown state'
-        self.infer_message()
-
-    def infer_message(self):
-        if self.code == 200:
-            self.message = 'Data read'
-        elif self.code == 500:
-            self.message = 'Data NOT read: endpoint returned internal error'
-        elif self.code == 99:
-            self.message = 'Data NOT read: unknown error'
-        elif self.code == 100:
-            self.message = 'Invalid configuration'
-
-    def as_dict(self):
-        return {self.operation: {'type': self.operation_type, 'code': self.code, 'message': self.message}}
+    __slots__ = ()
+    operation = 'Reading data over Rest API'
+    operation_type = 'restapi_read'
+    messages = {
+        200: 'Data read',
+        500: 'Data NOT read: endpoint returned internal error',
+        99: 'Data NOT read: unknown error',
+        100: 'Invalid configuration',
+    }
+
+
+class InletExecutionStatus(DataChunkStatus):
+    __slots__ = ()
+    operation = 'Inlet execution'
+    operation_type = 'inlet_execution'
+    messages = {
+        0: 'Inlet executed',
+        1: 'Inlet NOT executed: timeout exceeded',
+        2: 'Inlet NOT executed: previous execution still running',
+        99: 'Inlet NOT executed: unknown error',
+    }
@@ -2,12 +2,16 @@ from abc import ABC, abstractmethod
 
 
 class MetadataChunk(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def as_dict(self):
         pass
 
 
 class MetadataChunkData(MetadataChunk):
+    __slots__ = ('name', 'value')
+
     def __init__(self, name: str, value):
         self.name = name
         self.value = value
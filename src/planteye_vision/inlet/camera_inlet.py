@@ -1,27 +1,37 @@
 from abc import abstractmethod
 from planteye_vision.inlet.inlet import Inlet
 from planteye_vision.common.camera_status import CameraStatus
+from planteye_vision.common.frame_buffer_pool import FrameBufferPool
 from planteye_vision.configuration.inlet_configuration import CameraConfiguration
 
 
 class CameraInlet(Inlet):
     """
     This class describes a generic capturing device connected via OpenCV
+    Frames are captured into the buffers of a frame buffer pool, if its size is not 0.
     """
+    # Parameters of PlantEye that are not passed to the capturing device
+    inlet_parameters = ['frame_buffer_pool_size']
+
     def __init__(self, config: CameraConfiguration):
         self.config = config
         self.name = None
         self.type = None
         self.camera_object = None
         self.camera_status = CameraStatus()
+        self.frame_buffer_pool = None
 
     def apply_configuration(self):
         configured_all_parameters = True
         for parameter, value in self.config.parameters.items():
+            if parameter in self.inlet_parameters:
+                continue
             configured_all_parameters *= self.set_parameter(parameter, value)
         self.camera_status.fully_configured = configured_all_parameters
         self.name = self.config.name
         self.type = self.config.type
+        frame_buffer_pool_size = self.config.parameters.get('frame_buffer_pool_size', 0)
+        self.frame_buffer_pool = FrameBufferPool(frame_buffer_pool_size) if frame_buffer_pool_size > 0 else None
         self.camera_status.configured = True
 
     @abstractmethod
@@ -40,5 +50,16 @@ class CameraInlet(Inlet):
     def retrieve_data(self):
         pass
 
+    def can_update_configuration(self, config: CameraConfiguration):
+        return config.type == self.config.type and config.parameters['device_id'] == self.config.parameters['device_id']
+
+    def update_configuration(self, config: CameraConfiguration):
+        self.config = config
+        CameraInlet.apply_configuration(self)
+
+    def release(self):
+        if self.camera_object is not None:
+            self.disconnect()
+
     def execute(self):
         return super().execute()
@@ -79,6 +79,22 @@ class GenericCameraInlet(CameraInlet):
             logging.warning('Capturing device could not be released')
             self.camera_status.initialised = True
 
+    def read_frame(self):
+        if self.frame_buffer_pool is None:
+            return self.camera_object.read()
+        # The device writes into a free pooled buffer, a new frame is allocated if no buffer is free
+        frame_buffer = self.frame_buffer_pool.acquire()
+        if frame_buffer is None:
+            captured, frame_np = self.camera_object.read()
+        else:
+            captured, frame_np = self.camera_object.read(image=frame_buffer)
+            if not captured or frame_np is not frame_buffer:
+                # The device did not write into the buffer (e.g. other resolution), it is free again
+                self.frame_buffer_pool.release([frame_buffer])
+        if captured:
+            self.frame_buffer_pool.retain(frame_np)
+        return captured, frame_np
+
     def retrieve_data(self):
         data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
 
@@ -109,11 +125,13 @@ class GenericCameraInlet(CameraInlet):
             return [data_chunk]
 
         self.camera_status.capturing = True
-        captured, frame_np = self.camera_object.read()
+        captured, frame_np = self.read_frame()
         self.camera_status.capturing = False
 
         if captured:
-            data_chunk.add_data(DataChunkImage('frame', frame_np, 'base64_png'))
+            # Pooled frames are shared with the pool, they are copied before being changed
+            pooled = self.frame_buffer_pool is not None
+            data_chunk.add_data(DataChunkImage('frame', frame_np, 'base64_png', shared=pooled))
 
             status = CapturingStatus(0)
             data_chunk.add_status(status)
@@ -47,11 +47,14 @@ class GenericCameraVideoInlet(GenericCameraInlet):
         frames = []
         interval_btw_frames = 1/self.config.parameters['fps']
         for _ in range(self.config.parameters['no_frames']):
-            captured, frame_np = self.camera_object.read()
+            captured, frame_np = self.read_frame()
             if captured:
                 frames.append(frame_np)
                 sleep(interval_btw_frames)
             else:
+                if self.frame_buffer_pool is not None:
+                    # Frames captured so far are dropped, their buffers are free again
+                    self.frame_buffer_pool.release(frames)
                 status = CapturingStatus(99)
                 data_chunk.add_status(status)
                 logging.debug(status.get_message())
@@ -61,9 +64,10 @@ class GenericCameraVideoInlet(GenericCameraInlet):
         self.camera_status.capturing = False
 
         frame_no = 0
+        pooled = self.frame_buffer_pool is not None
         for frame in frames:
             frame_name = f'frame{str(frame_no).zfill(3)}'
-            data_chunk.add_data(DataChunkImage(frame_name, frame, 'base64_png'))
+            data_chunk.add_data(DataChunkImage(frame_name, frame, 'base64_png', shared=pooled))
             frame_no += 1
 
         frame_shape = frames[0].shape
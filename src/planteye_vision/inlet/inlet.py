@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 import time
 import logging
 
+from planteye_vision.common.metrics import metrics, chunks_nbytes, chunks_have_errors
+
 
 class Inlet(ABC):
     @abstractmethod
@@ -12,12 +14,27 @@ class Inlet(ABC):
     def retrieve_data(self):
         pass
 
+    def can_update_configuration(self, config):
+        return False
+
+    def update_configuration(self, config):
+        pass
+
+    def release(self):
+        pass
+
     @abstractmethod
     def execute(self):
         begin_time = time.time()
         logging.debug(f'Inlet {self.name} ({self.type}) execution began')
-        inlet_result = self.retrieve_data()
+        try:
+            inlet_result = self.retrieve_data()
+        except Exception:
+            metrics.record('inlet', self.name, self.type, time.time() - begin_time, error=True)
+            raise
         end_time = time.time()
         exec_duration = end_time - begin_time
+        metrics.record('inlet', self.name, self.type, exec_duration, error=chunks_have_errors(inlet_result),
+                       nbytes=chunks_nbytes(inlet_result))
         logging.info(f'Inlet {self.name} ({self.type}) execution finished (exec time {exec_duration:.3f} s)')
         return inlet_result
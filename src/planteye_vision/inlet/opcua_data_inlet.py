@@ -36,6 +36,22 @@ class OPCUADataInlet(Inlet):
         self.opcua_client = OPCUAClient(opcua_server_url, opcua_server_username, opcua_server_pwd)
         self.opcua_client.connect()
 
+    def can_update_configuration(self, config: OPCUAValueConfiguration):
+        for parameter in ['server', 'username', 'password']:
+            if config.parameters[parameter] != self.config.parameters[parameter]:
+                return False
+        return True
+
+    def update_configuration(self, config: OPCUAValueConfiguration):
+        self.config = config
+        self.name = self.config.name
+        self.type = self.config.type
+
+    def release(self):
+        if self.opcua_client is not None:
+            self.opcua_client.disconnect()
+            self.opcua_client = None
+
     def retrieve_data(self):
         data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
 
@@ -1,8 +1,11 @@
 import logging
 
+import numpy as np
+
 from planteye_vision.inlet.inlet import Inlet
 from planteye_vision.configuration.inlet_configuration import RestAPIInletConfiguration
 from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_container import unpack_container, CONTAINER_MEDIA_TYPE
 from planteye_vision.data_chunks.data_chunk_data import *
 from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
 from planteye_vision.data_chunks.data_chunk_status import *
@@ -33,6 +36,9 @@ class RestAPIDataInlet(Inlet):
             logging.error('Empty data returned')
             return []
         if response.status_code == 200:
+            if response.headers.get('Content-Type', '').startswith(CONTAINER_MEDIA_TYPE):
+                header, buffers = unpack_container(response.content)
+                return self.parse_data_chunks(header['chunks'], buffers)
             return self.parse_data_chunks(response.json())
         else:
             logging.error('Empty data returned')
@@ -40,11 +46,14 @@ class RestAPIDataInlet(Inlet):
 
     def request_json(self):
         try:
-            return requests.get(self.config.parameters['endpoint'])
+            # The binary container is preferred, a JSON response is accepted from older instances
+            headers = {'Accept': f'{CONTAINER_MEDIA_TYPE}, application/json;q=0.5'}
+            params = {'image_format': self.config.parameters['image_format']}
+            return requests.get(self.config.parameters['endpoint'], headers=headers, params=params)
         except Exception:
             return None
 
-    def parse_data_chunks(self, json):
+    def parse_data_chunks(self, json, buffers: list = None):
         logging.debug('Data chunks parsing began...')
         step_begin = time()
         data_chunks = []
@@ -54,7 +63,7 @@ class RestAPIDataInlet(Inlet):
             parameters = data_chunk_content['parameters']
             data_chunk = GeneralDataChunk(name, chunk_type, parameters, hidden=self.config.hidden)
 
-            [data_chunk.add_data(data_chunk_data) for data_chunk_data in self.parse_data(data_chunk_content)]
+            [data_chunk.add_data(data_chunk_data) for data_chunk_data in self.parse_data(data_chunk_content, buffers)]
             [data_chunk.add_metadata(data_chunk_data) for data_chunk_data in self.parse_metadata(data_chunk_content)]
             [data_chunk.add_status(data_chunk_data) for data_chunk_data in self.parse_status(data_chunk_content)]
 
@@ -66,7 +75,7 @@ class RestAPIDataInlet(Inlet):
         return data_chunks
 
     @staticmethod
-    def parse_data(data_chunk_dict):
+    def parse_data(data_chunk_dict, buffers: list = None):
         if 'data' not in data_chunk_dict.keys():
             return []
         if len(data_chunk_dict['data']) == 0:
@@ -75,12 +84,14 @@ class RestAPIDataInlet(Inlet):
         for data_chunk_data_name, data_chunk_data_content in data_chunk_dict['data'].items():
             data_name = data_chunk_data_content['name']
             data_type = data_chunk_data_content['type']
-            data_value = data_chunk_data_content['value']
+            data_value = data_chunk_data_content.get('value')
 
             logging.debug(f'Data parsing for chunk {data_name} ({data_type}) began...')
             step_begin = time()
 
-            if data_type == 'base64_png':
+            if 'buffer' in data_chunk_data_content.keys() and buffers is not None:
+                data_chunks.append(RestAPIDataInlet.parse_buffer(data_chunk_data_content, buffers))
+            elif data_type.startswith('base64_'):
                 data_chunks.append(DataChunkImage(data_name, data_value, data_type))
             else:
                 data_chunks.append(DataChunkValue(data_name, data_value, data_type))
@@ -89,6 +100,17 @@ class RestAPIDataInlet(Inlet):
 
         return data_chunks
 
+    @staticmethod
+    def parse_buffer(data_chunk_data_content, buffers: list):
+        data_name = data_chunk_data_content['name']
+        data_type = data_chunk_data_content['type']
+        encoding = data_chunk_data_content['encoding']
+        buffer = buffers[data_chunk_data_content['buffer']]
+        if encoding == 'raw':
+            frame = np.frombuffer(buffer, dtype=np.dtype(data_chunk_data_content['dtype']))
+            return DataChunkImage(data_name, frame.reshape(data_chunk_data_content['shape']), data_type, shared=True)
+        return DataChunkImage.from_encoded(data_name, buffer, encoding, data_type)
+
     @staticmethod
     def parse_metadata(data_chunk_dict):
         if 'metadata' not in data_chunk_dict.keys():
@@ -127,6 +149,8 @@ class RestAPIDataInlet(Inlet):
                 status_chunks.append(OPCUAReadStatus(status_code))
             elif operation_type == 'restapi_read':
                 status_chunks.append(RestAPIReadStatus(status_code))
+            elif operation_type == 'inlet_execution':
+                status_chunks.append(InletExecutionStatus(status_code))
 
         return status_chunks
 
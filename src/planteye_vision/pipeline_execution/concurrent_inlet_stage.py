@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from planteye_vision.common.frame_buffer_pool import release_frame_buffers
+from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_status import InletExecutionStatus
+from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
+
+
+class ConcurrentInletStage:
+    """
+    This class executes all data inlets of a pipeline step concurrently, each inlet in its own worker thread.
+    The step lasts as long as the slowest inlet (or its timeout), results are returned in the order of the inlets.
+    An inlet is never executed twice at the same time, also not by overlapping steps (e.g. concurrent requests).
+    """
+    def __init__(self, inlets: list):
+        self.inlets = inlets
+        self.thread_pool = ThreadPoolExecutor(max_workers=max(len(inlets), 1), thread_name_prefix='inlet')
+        self.running = {}
+        self.running_lock = threading.Lock()
+
+    def shutdown(self):
+        self.thread_pool.shutdown(wait=False)
+
+    def execute(self):
+        step_begin = time.time()
+        futures = []
+        with self.running_lock:
+            for inlet in self.inlets:
+                if id(inlet) in self.running:
+                    futures.append(None)
+                    continue
+                future = self.thread_pool.submit(self._timed_execution, inlet, step_begin)
+                self.running[id(inlet)] = future
+                futures.append(future)
+        # Finished futures are forgotten right away, so that they do not keep the results (e.g. frames) alive
+        for inlet, future in zip(self.inlets, futures):
+            if future is not None:
+                future.add_done_callback(lambda done_future, inlet_id=id(inlet): self._forget(inlet_id, done_future))
+
+        data_chunks = []
+        for inlet, future in zip(self.inlets, futures):
+            if future is None:
+                logging.warning(f'Inlet {inlet.name} ({inlet.type}): previous execution still running, step skipped')
+                data_chunks.append(self._status_chunk(inlet, InletExecutionStatus(2)))
+                continue
+
+            try:
+                inlet_result, wait_time, run_time = future.result(timeout=self._remaining_time(inlet, step_begin))
+            except TimeoutError:
+                logging.error(f'Inlet {inlet.name} ({inlet.type}): timeout of {inlet.config.timeout} ms exceeded')
+                # The late result is dropped, its frame buffers are free again
+                future.add_done_callback(self._discard_late_result)
+                data_chunks.append(self._status_chunk(inlet, InletExecutionStatus(1)))
+                continue
+            except Exception as exc:
+                logging.error(f'Inlet {inlet.name} ({inlet.type}): error during execution', exc_info=exc)
+                data_chunks.append(self._status_chunk(inlet, InletExecutionStatus(99)))
+                continue
+
+            for data_chunk in inlet_result:
+                data_chunk.add_metadata(MetadataChunkData('wait_time', round(wait_time * 1000, 3)))
+                data_chunk.add_metadata(MetadataChunkData('run_time', round(run_time * 1000, 3)))
+            data_chunks.extend(inlet_result)
+
+        return data_chunks
+
+    def _forget(self, inlet_id: int, future):
+        with self.running_lock:
+            if self.running.get(inlet_id) is future:
+                del self.running[inlet_id]
+
+    @staticmethod
+    def _discard_late_result(future):
+        if not future.cancelled() and future.exception() is None:
+            release_frame_buffers(future.result()[0])
+
+    @staticmethod
+    def _timed_execution(inlet, step_begin: float):
+        begin_time = time.time()
+        inlet_result = inlet.execute()
+        end_time = time.time()
+        return inlet_result, begin_time - step_begin, end_time - begin_time
+
+    @staticmethod
+    def _remaining_time(inlet, step_begin: float):
+        if inlet.config.timeout is None:
+            return None
+        return max(step_begin + inlet.config.timeout / 1000.0 - time.time(), 0)
+
+    @staticmethod
+    def _status_chunk(inlet, status):
+        data_chunk = GeneralDataChunk(inlet.name, inlet.type, inlet.config.parameters, hidden=inlet.config.hidden)
+        data_chunk.add_status(status)
+        return data_chunk
@@ -0,0 +1,165 @@
+import copy
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from planteye_vision.configuration.processor_configuration import ProcessorConfiguration
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.processors.data_processor import DataProcessor
+
+
+CACHEABLE_PROCESSOR_TYPES = ['image_resize', 'image_crop', 'color_conversion', 'pt_inference', 'tf_inference']
+
+CHUNK_OVERHEAD_BYTES = 256
+
+
+class OutputCache:
+    """
+    This class describes a least recently used cache of processor outputs with a memory limit (in bytes).
+    """
+    def __init__(self, memory_limit: int):
+        self.memory_limit = memory_limit
+        self.memory_used = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        if size > self.memory_limit:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.memory_used -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.memory_used += size
+            self._evict()
+
+    def set_memory_limit(self, memory_limit: int):
+        with self.lock:
+            self.memory_limit = memory_limit
+            self._evict()
+
+    def _evict(self):
+        while self.memory_used > self.memory_limit and len(self.entries) > 0:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.memory_used -= size
+
+
+class CachedProcessor(DataProcessor):
+    """
+    This class wraps a processor with an output cache.
+    The cache key is a fast hash (crc32 and adler32) of the input frames and values plus the processor parameters,
+    so the wrapped processor is only executed for inputs it has not seen recently.
+    """
+    def __init__(self, processor: DataProcessor, output_cache: OutputCache):
+        self.processor = processor
+        self.config = processor.config
+        self.name = processor.name
+        self.type = processor.type
+        self.output_cache = output_cache
+
+    def can_update_configuration(self, config: ProcessorConfiguration):
+        return config.cache and self.processor.can_update_configuration(config)
+
+    def update_configuration(self, config: ProcessorConfiguration):
+        self.processor.update_configuration(config)
+        self.config = config
+        self.name = self.processor.name
+        self.type = self.processor.type
+
+    def release(self):
+        self.processor.release()
+
+    def apply_processor(self, chunks: list):
+        key = (self.config.name, self.config.type, repr(self.config.parameters), fingerprint_chunks(chunks))
+        cached_output = self.output_cache.get(key)
+        if cached_output is not None:
+            logging.debug(f'Processor {self.name} ({self.type}): output taken from cache')
+            return restore_output(cached_output, chunks)
+
+        result = self.processor.apply_processor(chunks)
+        if isinstance(result, list) and not any([status.code != 0 for chunk in result for status in chunk.status]):
+            stored_output, size = store_output(result, chunks)
+            self.output_cache.put(key, stored_output, size)
+        return result
+
+
+def fingerprint_chunks(chunks: list):
+    # Metadata (e.g. timestamps) is not part of the fingerprint, only what processors compute with
+    fingerprint = []
+    for chunk in chunks:
+        data_fingerprint = []
+        for chunk_data in chunk.data:
+            value = chunk_data.value
+            if isinstance(value, np.ndarray):
+                frame = np.ascontiguousarray(value)
+                value_fingerprint = (frame.shape, frame.dtype.str, zlib.crc32(frame), zlib.adler32(frame))
+            else:
+                value_fingerprint = repr(value)
+            data_fingerprint.append((chunk_data.name, chunk_data.data_type, value_fingerprint))
+        fingerprint.append((chunk.name, chunk.chunk_type, chunk.hidden, tuple(data_fingerprint)))
+    return tuple(fingerprint)
+
+
+def store_output(result: list, input_chunks: list):
+    # Chunks passed through from the input are stored as references to the input position
+    stored_output = []
+    size = 0
+    for chunk in result:
+        input_index = next((index for index, input_chunk in enumerate(input_chunks) if input_chunk is chunk), None)
+        if input_index is not None:
+            stored_output.append(('input', input_index))
+            continue
+        stored_chunk = copy_chunk(chunk, detach=True)
+        stored_output.append(('chunk', stored_chunk))
+        size += chunk_nbytes(stored_chunk)
+    return stored_output, size
+
+
+def restore_output(stored_output: list, input_chunks: list):
+    return [input_chunks[item] if kind == 'input' else copy_chunk(item) for kind, item in stored_output]
+
+
+def copy_chunk(chunk, detach: bool = False):
+    # New chunk and data objects sharing the frames read-only, thus the cached frames are never altered
+    chunk_copy = copy.copy(chunk)
+    chunk_copy.data = [copy_image(chunk_data, detach)
+                       if isinstance(chunk_data, DataChunkImage) and chunk_data.value is not None
+                       else copy.copy(chunk_data) for chunk_data in chunk.data]
+    chunk_copy.metadata = list(chunk.metadata)
+    chunk_copy.status = list(chunk.status)
+    return chunk_copy
+
+
+def copy_image(image: DataChunkImage, detach: bool = False):
+    # A detached frame is copied if it is a view (e.g. a crop), so that the cache neither keeps its whole base frame
+    # alive nor holds frames of the frame buffer pool of a camera
+    if detach and isinstance(image.value, np.ndarray) and image.value.base is not None:
+        return DataChunkImage(image.name, image.value.copy(), image.data_type, shared=True)
+    return image.share()
+
+
+def chunk_nbytes(chunk):
+    nbytes = CHUNK_OVERHEAD_BYTES
+    for chunk_data in chunk.data:
+        if isinstance(chunk_data.value, np.ndarray):
+            nbytes += chunk_data.value.nbytes
+        elif isinstance(chunk_data.value, (str, bytes)):
+            nbytes += len(chunk_data.value)
+        else:
+            nbytes += CHUNK_OVERHEAD_BYTES
+    return nbytes
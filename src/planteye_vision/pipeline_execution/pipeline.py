@@ -0,0 +1,160 @@
+import logging
+import threading
+
+from planteye_vision.configuration.execution_configuration import ExecutionConfiguration
+from planteye_vision.pipeline_execution.concurrent_inlet_stage import ConcurrentInletStage
+from planteye_vision.pipeline_execution.processor_graph import ProcessorGraph
+from planteye_vision.processors.input_processor import InputProcessor
+from planteye_vision.processors.save_on_disc_processor import SaveOnDiskProcessor
+
+
+class Pipeline:
+    """
+    This class describes a set of configured inlets and processors that is executed as a whole.
+    A pipeline counts its ongoing executions, so that it can be retired and released only after they are finished.
+    Processors whose output is hidden and not consumed by any other processor are eliminated once on construction.
+    Components taken over from the previous pipeline with a changed configuration are updated only when the previous
+    pipeline is drained, until then executions of this pipeline wait.
+    """
+    def __init__(self, inlets: list, processors: list, execution_config: ExecutionConfiguration, process_pool=None,
+                 pending_updates: list = None):
+        self.inlets = inlets
+        self.processors = processors
+        self.process_pool = process_pool
+        self.process_workers = execution_config.parameters['process_workers']
+        self.processor_workers = execution_config.parameters['processor_workers']
+        self.inlet_stage = ConcurrentInletStage(self.inlets)
+        self.processor_graph = None
+        self.executed_processors = []
+
+        self.executions = 0
+        self.released = False
+        self.condition = threading.Condition()
+        self.pending_updates = pending_updates or []
+        self.ready = threading.Event()
+        if len(self.pending_updates) == 0:
+            self.link_processors()
+
+    def link_processors(self):
+        # Processors are linked by their configuration, thus only after pending updates are applied
+        if any([processor.config.inputs is not None for processor in self.processors]):
+            self.processor_graph = ProcessorGraph(self.processors, self.processor_workers)
+            logging.info(f'Processors linked as graph ({self.processor_workers} workers)')
+            self.executed_processors = self.processor_graph.processors
+        else:
+            self.processor_graph = None
+            self.executed_processors = self.eliminate_dead_processors(self.processors)
+        self.ready.set()
+
+    def acquire(self):
+        self.ready.wait()
+        with self.condition:
+            self.executions += 1
+
+    def release(self):
+        with self.condition:
+            self.executions -= 1
+            self.condition.notify_all()
+
+    def retire(self, successor=None):
+        threading.Thread(target=self._release_when_drained, args=[successor]).start()
+
+    def _release_when_drained(self, successor):
+        with self.condition:
+            while self.executions > 0:
+                self.condition.wait()
+        self.release_resources(successor)
+        if successor is not None:
+            successor.apply_pending_updates()
+
+    def apply_pending_updates(self):
+        for component, config in self.pending_updates:
+            try:
+                component.update_configuration(config)
+                logging.info(f'Component: Name {config.name}, Type {config.type} re-parameterised')
+            except Exception as exc:
+                logging.error(f'Component: Name {config.name}, Type {config.type} cannot be re-parameterised',
+                              exc_info=exc)
+        self.pending_updates = []
+        self.link_processors()
+
+    def release_resources(self, successor=None):
+        if self.released:
+            return
+        self.released = True
+        retained_ids = []
+        if successor is not None:
+            retained_ids = [id(component) for component in successor.inlets + successor.processors]
+            retained_ids.append(id(successor.process_pool))
+        self.inlet_stage.shutdown()
+        if self.processor_graph is not None:
+            self.processor_graph.shutdown()
+        if self.process_pool is not None and id(self.process_pool) not in retained_ids:
+            self.process_pool.shutdown(wait=False)
+        for inlet in self.inlets:
+            if id(inlet) not in retained_ids:
+                inlet.release()
+        for processor in self.processors:
+            if id(processor) not in retained_ids:
+                processor.release()
+        logging.info('Resources of the previous pipeline released')
+
+    def inlets_execute(self):
+        return self.inlet_stage.execute()
+
+    def processors_execute(self, data_chunks, deferred_outputs: list = None):
+        if self.processor_graph is not None:
+            return self.processor_graph.execute(data_chunks, deferred_outputs)
+
+        processing_result = data_chunks
+        processor_results = []
+
+        for processor in self.executed_processors:
+
+            if isinstance(processor, InputProcessor):
+                processing_result = processor.execute(processing_result)
+                if len(processing_result) == 0:
+                    logging.error('Pipeline execution aborted, input processor returned nothing')
+                    break
+                continue
+
+            elif isinstance(processor, SaveOnDiskProcessor):
+                results_to_save = self.remove_duplicates(data_chunks+processor_results)
+                if deferred_outputs is not None:
+                    deferred_outputs.append((processor, results_to_save))
+                else:
+                    processor.execute(results_to_save)
+                continue
+
+            processing_result = processor.execute(processing_result)
+            if any([len(chunk.data) == 0 for chunk in processing_result]):
+                logging.error(f'Pipeline execution aborted, processor {processor.name} returned nothing')
+                break
+
+            # Hidden chunks are only needed by the next processor, which gets them as processing_result
+            processor_results.extend([chunk for chunk in processing_result if not chunk.hidden])
+
+        return processor_results
+
+    @staticmethod
+    def eliminate_dead_processors(processors: list):
+        # In a linear chain, a hidden processor is only needed if a processor after it is needed
+        last_live_index = -1
+        for index, processor in enumerate(processors):
+            if isinstance(processor, (InputProcessor, SaveOnDiskProcessor)):
+                continue
+            if not processor.config.hidden:
+                last_live_index = index
+
+        live_processors = []
+        for index, processor in enumerate(processors):
+            if index > last_live_index and not isinstance(processor, (InputProcessor, SaveOnDiskProcessor)):
+                logging.info(f'Processor {processor.name} ({processor.type}) eliminated, its hidden output is not '
+                             f'consumed')
+                continue
+            live_processors.append(processor)
+        return live_processors
+
+    @staticmethod
+    def remove_duplicates(data_chunks):
+        return list(dict.fromkeys(data_chunks))
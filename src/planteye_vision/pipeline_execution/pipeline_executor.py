@@ -4,18 +4,19 @@ from planteye_vision.inlet.static_data_inlet import StaticDataInlet
 from planteye_vision.inlet.restapi_inlet import RestAPIDataInlet
 from planteye_vision.shell.rest_api_shell import RestAPIShell
 from planteye_vision.shell.periodical_local_shell import PeriodicalLocalShell
-from planteye_vision.processors.chunks_to_dict_processor import ChunksToDict
-from planteye_vision.processors.encode_image_chunks_to_base_64_processor import EncodeImageChunksToBase64
-from planteye_vision.processors.image_color_conversion_processor import ImageColorConversion
-from planteye_vision.processors.image_crop_processor import ImageCrop
-from planteye_vision.processors.image_resize_processor import ImageResize
-from planteye_vision.processors.input_processor import InputProcessor
-from planteye_vision.processors.save_on_disc_processor import SaveOnDiskProcessor
+from planteye_vision.processors.processor_factory import create_processor
 from planteye_vision.configuration.planteye_configuration import PlantEyeConfiguration
 from planteye_vision.processors.data_processor import ConfigurableDataProcessor
+from planteye_vision.pipeline_execution.pipeline import Pipeline
+from planteye_vision.pipeline_execution.pipeline_result import PipelineResult
+from planteye_vision.common.timestamp import get_timestamp
+from planteye_vision.common.frame_buffer_pool import release_frame_buffers
 
-import json
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import logging
+import multiprocessing
+import threading
 import time
 
 
@@ -23,26 +24,61 @@ class PipeLineExecutor:
     def __init__(self, config: PlantEyeConfiguration):
         self.config = config
         self.shell = None
-        self.inlets = []
-        self.processors = []
-        self.cfg_update_flag = False
+        self.pipeline = Pipeline([], [], self.config.get_execution_config())
+        self.pipeline_lock = threading.Lock()
+        self.update_lock = threading.Lock()
+        self.output_cache = None
+        self.execution_ids = itertools.count(1)
 
     def apply_configuration(self):
         logging.info('PIPELINE CONFIGURATION')
         if self.config.is_valid():
+            # The shell starts executions (e.g. a background loop) right away, they must not run the empty pipeline
+            self.swap_pipeline(self.build_pipeline())
             self.configure_shell()
-            self.configure_inlets()
-            self.configure_processors()
         else:
             logging.error('Cannot apply configuration, configuration is invalid')
 
-    def update_configuration(self):
-        logging.info('CONFIGURATION UPDATE')
-        self.cfg_update_flag = True
-        self.configure_inlets()
-        self.configure_processors()
-        self.cfg_update_flag = False
-        logging.info('New configuration applied')
+    def update_configuration(self, cfg_dict: dict):
+        with self.update_lock:
+            logging.info('CONFIGURATION UPDATE')
+            config = self.config.updated(cfg_dict)
+            if not config.is_valid():
+                logging.error('Cannot apply configuration update, configuration is invalid')
+                return False
+            self.config = config
+            if isinstance(self.shell, RestAPIShell):
+                self.shell.attach_planteye_configuration(config)
+            self.swap_pipeline(self.build_pipeline(self.pipeline))
+            logging.info('New configuration applied')
+            return True
+
+    def build_pipeline(self, previous_pipeline: Pipeline = None):
+        # Re-parameterisation of reused components is applied only after the previous pipeline is drained
+        pending_updates = []
+        if previous_pipeline is None:
+            inlets = self.configure_inlets()
+            processors, process_pool = self.configure_processors()
+        else:
+            inlets = self.configure_inlets(previous_pipeline.inlets, pending_updates)
+            previous_process_pool = None
+            if previous_pipeline.process_workers == self.config.get_execution_config().parameters['process_workers']:
+                previous_process_pool = previous_pipeline.process_pool
+            processors, process_pool = self.configure_processors(previous_pipeline.processors, previous_process_pool,
+                                                                 pending_updates)
+        return Pipeline(inlets, processors, self.config.get_execution_config(), process_pool, pending_updates)
+
+    def swap_pipeline(self, pipeline: Pipeline):
+        with self.pipeline_lock:
+            previous_pipeline = self.pipeline
+            self.pipeline = pipeline
+        previous_pipeline.retire(pipeline)
+
+    def acquire_pipeline(self):
+        with self.pipeline_lock:
+            pipeline = self.pipeline
+            pipeline.acquire()
+        return pipeline
 
     def configure_shell(self):
         logging.info('SHELL CONFIGURATION:')
@@ -50,6 +86,8 @@ class PipeLineExecutor:
         shell_config = self.config.get_shell_config()
         if shell_config.type == 'periodical_local':
             self.shell = PeriodicalLocalShell(shell_config)
+            self.shell.attach_stage_callbacks(self.capture_stage_execution, self.processing_stage_execution,
+                                              self.output_stage_execution, self.discard_stage_result)
         elif shell_config.type == 'rest_api':
             self.shell = RestAPIShell(shell_config)
             self.shell.attach_planteye_configuration(self.config)
@@ -59,16 +97,24 @@ class PipeLineExecutor:
             self.shell = None
             logging.error(f'Unsupported shell type {shell_config.type}')
             return
-        self.shell.attach_callback(self.single_execution)
+        if isinstance(self.shell, RestAPIShell):
+            self.shell.attach_callback(self.execute_pipeline)
+        else:
+            self.shell.attach_callback(self.single_execution)
         self.shell.apply_configuration()
         logging.info('Shell configured')
 
-    def configure_inlets(self):
-        self.inlets = []
+    def configure_inlets(self, previous_inlets: list = (), pending_updates: list = None):
         logging.info('INLETS CONFIGURATION:')
         inlet_configs = self.config.get_inlet_configs()
+        previous_inlets_by_name = {inlet.config.name: inlet for inlet in previous_inlets}
         inlets_obj = []
         for inlet_config in inlet_configs:
+            inlet = self.reuse_component(previous_inlets_by_name.get(inlet_config.name), inlet_config, pending_updates)
+            if inlet is not None:
+                inlets_obj.append(inlet)
+                continue
+
             if inlet_config.type == 'local_camera_cv2':
                 inlet = GenericCameraInlet(inlet_config)
             elif inlet_config.type == 'local_camera_cv2_video':
@@ -90,89 +136,159 @@ class PipeLineExecutor:
             inlets_obj.append(inlet)
             logging.info(f'Inlet: Name {inlet_config.name}, Type {inlet_config.type} added')
 
-        self.inlets = inlets_obj
         logging.info('Inlets configured successfully')
+        return inlets_obj
 
-    def configure_processors(self):
-        self.processors = []
+    def configure_processors(self, previous_processors: list = (), previous_process_pool=None,
+                             pending_updates: list = None):
         logging.info('PROCESSORS CONFIGURATION:')
         processors_configs = self.config.get_processor_configs()
+        process_pool = self.configure_process_pool(processors_configs, previous_process_pool)
+        output_cache = self.configure_output_cache(processors_configs)
+        previous_processors_by_name = {processor.config.name: processor for processor in previous_processors}
         processors_obj = []
         for processor_config in processors_configs:
-            if processor_config.type == 'input':
-                processor = InputProcessor(processor_config)
-            elif processor_config.type == 'image_resize':
-                processor = ImageResize(processor_config)
-            elif processor_config.type == 'image_crop':
-                processor = ImageCrop(processor_config)
-            elif processor_config.type == 'color_conversion':
-                processor = ImageColorConversion(processor_config)
-            elif processor_config.type == 'tf_inference':
-                from planteye_vision.processors.tf_model_inference_processor import TFModelInference
-                processor = TFModelInference(processor_config)
-            elif processor_config.type == 'pt_inference':
-                from planteye_vision.processors.pt_model_inference_processor import PTModelInference
-                processor = PTModelInference(processor_config)
-            elif processor_config.type == 'save_on_disk':
-                processor = SaveOnDiskProcessor(processor_config)
+            previous_processor = previous_processors_by_name.get(processor_config.name)
+            if previous_processor is not None and previous_processor.config.cache != processor_config.cache:
+                previous_processor = None
+            if not processor_config.run_in_process:
+                processor = self.reuse_component(previous_processor, processor_config, pending_updates)
+                if processor is not None:
+                    processors_obj.append(processor)
+                    continue
+
+            if processor_config.run_in_process and process_pool is not None:
+                from planteye_vision.pipeline_execution.process_pool_execution import ProcessPoolProcessor
+                processor = ProcessPoolProcessor(processor_config, process_pool)
             else:
-                logging.error('Unsupported inlet type %s' % processor_config.type)
+                processor = create_processor(processor_config)
+            if processor is None:
                 continue
 
             if isinstance(processor, ConfigurableDataProcessor):
                 processor.apply_configuration()
 
+            if processor_config.cache:
+                from planteye_vision.pipeline_execution.output_cache import CachedProcessor
+                processor = CachedProcessor(processor, output_cache)
+
             processors_obj.append(processor)
             logging.info(f'Processor: Name {processor.name}, Type {processor.type} added')
 
-        self.processors = processors_obj
         logging.info('Processors configured successfully')
+        return processors_obj, process_pool
 
-    def single_execution(self):
+    @staticmethod
+    def reuse_component(previous_component, config, pending_updates: list = None):
+        if previous_component is None or previous_component.config.type != config.type:
+            return None
+        if previous_component.config is config:
+            logging.info(f'Component: Name {config.name}, Type {config.type} unchanged, reused')
+            return previous_component
+        if pending_updates is not None and previous_component.can_update_configuration(config):
+            # The previous pipeline might still execute the component, it is updated once that pipeline is drained
+            pending_updates.append((previous_component, config))
+            logging.info(f'Component: Name {config.name}, Type {config.type} reused, re-parameterised when the '
+                         f'previous pipeline is drained')
+            return previous_component
+        return None
+
+    def configure_process_pool(self, processors_configs, previous_process_pool=None):
+        pool_processors_configs = [processor_config for processor_config in processors_configs
+                                   if processor_config.run_in_process]
+        if len(pool_processors_configs) == 0:
+            return None
+
+        from planteye_vision.pipeline_execution.process_pool_execution import PROCESS_POOL_PROCESSOR_TYPES
+        for processor_config in pool_processors_configs:
+            if processor_config.type not in PROCESS_POOL_PROCESSOR_TYPES:
+                logging.warning(f'Processor {processor_config.name} ({processor_config.type}) cannot be executed '
+                                f'in a worker process, it will be executed locally')
+                processor_config.run_in_process = False
+
+        if previous_process_pool is not None:
+            logging.info('Process pool for processors reused')
+            return previous_process_pool
+        max_workers = self.config.get_execution_config().parameters['process_workers']
+        # Workers are started lazily while webserver, inlet and scheduler threads are running, a forked worker could
+        # inherit locks held by these threads
+        process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        logging.info(f'Process pool for processors started ({max_workers} workers)')
+        return process_pool
+
+    def configure_output_cache(self, processors_configs):
+        cached_processors_configs = [processor_config for processor_config in processors_configs
+                                     if processor_config.cache]
+        if len(cached_processors_configs) == 0:
+            return None
+
+        from planteye_vision.pipeline_execution.output_cache import OutputCache, CACHEABLE_PROCESSOR_TYPES
+        for processor_config in cached_processors_configs:
+            if processor_config.type not in CACHEABLE_PROCESSOR_TYPES:
+                logging.warning(f'Output of processor {processor_config.name} ({processor_config.type}) cannot be '
+                                f'cached, it will be executed on every step')
+                processor_config.cache = False
+
+        memory_limit = int(self.config.get_execution_config().parameters['cache_memory_limit'] * 1024 * 1024)
+        if self.output_cache is None:
+            self.output_cache = OutputCache(memory_limit)
+            logging.info(f'Processor output cache started ({memory_limit} bytes)')
+        else:
+            self.output_cache.set_memory_limit(memory_limit)
+        return self.output_cache
+
+    def execute_pipeline(self):
         logging.info('PIPELINE EXECUTION STEP')
         begin_time = time.time()
         logging.debug('Pipeline execution began')
-        if self.cfg_update_flag:
-            logging.error('Pipeline execution aborted, configuration ongoing')
-            if isinstance(self.shell, RestAPIShell):
-                return json.dumps(None)
-            elif isinstance(self.shell, PeriodicalLocalShell):
-                return None
-
-        inlet_result = self.inlets_execute()
-        processors_result = self.processors_execute(inlet_result)
-        cleaned_processors_result = self.remove_duplicates(processors_result)
-        combined_result = inlet_result + cleaned_processors_result
 
-        if isinstance(self.shell, RestAPIShell):
-            EncodeImageChunksToBase64().execute(combined_result)
-            data_chunks_dict = ChunksToDict().execute(combined_result)
-            result = json.dumps(data_chunks_dict)
-        elif isinstance(self.shell, PeriodicalLocalShell):
-            result = combined_result
-        else:
-            result = None
+        timestamp = get_timestamp()
+        pipeline = self.acquire_pipeline()
+        try:
+            inlet_result = pipeline.inlets_execute()
+            try:
+                processors_result = pipeline.processors_execute(inlet_result)
+            except Exception:
+                release_frame_buffers(inlet_result)
+                raise
+            cleaned_processors_result = pipeline.remove_duplicates(processors_result)
+            combined_result = inlet_result + cleaned_processors_result
+        finally:
+            pipeline.release()
 
         end_time = time.time()
         exec_duration = end_time - begin_time
         logging.info(f'Pipeline execution finished (exec time {exec_duration:.3f} s)')
 
-        return result
+        return PipelineResult(combined_result, next(self.execution_ids), timestamp)
+
+    def single_execution(self):
+        result = self.execute_pipeline()
+        if isinstance(self.shell, RestAPIShell):
+            serialized_result = RestAPIShell.serialize_json(result.chunks)
+            result.release()
+            return serialized_result
+        elif isinstance(self.shell, PeriodicalLocalShell):
+            # The shell releases the frame buffers of the chunks
+            return result.chunks
+        result.release()
+        return None
 
     def silent_execution(self):
         logging.info('PIPELINE EXECUTION STEP (SILENT)')
         begin_time = time.time()
         logging.debug('Pipeline execution began')
-        if self.cfg_update_flag:
-            logging.error('Pipeline execution aborted, configuration ongoing')
-            if isinstance(self.shell, RestAPIShell):
-                return json.dumps(None)
-            elif isinstance(self.shell, PeriodicalLocalShell):
-                return None
 
         # Run only inlets and processors
-        inlet_result = self.inlets_execute()
-        _ = self.processors_execute(inlet_result)
+        pipeline = self.acquire_pipeline()
+        try:
+            inlet_result = pipeline.inlets_execute()
+            try:
+                _ = pipeline.processors_execute(inlet_result)
+            finally:
+                release_frame_buffers(inlet_result)
+        finally:
+            pipeline.release()
 
         end_time = time.time()
         exec_duration = end_time - begin_time
@@ -180,41 +296,42 @@ class PipeLineExecutor:
 
         return 'Silent execution completed', 200
 
-    def inlets_execute(self):
-        data_chunks = []
-        for inlet in self.inlets:
-            data_chunks.extend(inlet.execute())
-        return data_chunks
-
-    def processors_execute(self, data_chunks):
-        processing_result = data_chunks
-        processor_results = []
-
-        for processor in self.processors:
-
-            if isinstance(processor, InputProcessor):
-                processing_result = processor.execute(processing_result)
-                if len(processing_result) == 0:
-                    logging.error('Pipeline execution aborted, input processor returned nothing')
-                    break
-                continue
+    def capture_stage_execution(self):
+        pipeline = self.acquire_pipeline()
+        try:
+            return pipeline.inlets_execute()
+        finally:
+            pipeline.release()
 
-            elif isinstance(processor, SaveOnDiskProcessor):
-                results_to_save = self.remove_duplicates(data_chunks+processor_results)
-                processor.execute(results_to_save)
-                continue
-
-            processing_result = processor.execute(processing_result)
-            if any([len(chunk.data) == 0 for chunk in processing_result]):
-                logging.error(f'Pipeline execution aborted, processor {processor.name} returned nothing')
-                break
-
-            processor_results.extend(processing_result)
+    def processing_stage_execution(self, inlet_result):
+        begin_time = time.time()
+        deferred_outputs = []
+        pipeline = self.acquire_pipeline()
+        try:
+            processors_result = pipeline.processors_execute(inlet_result, deferred_outputs)
+        except Exception:
+            release_frame_buffers(inlet_result)
+            raise
+        finally:
+            pipeline.release()
+        combined_result = inlet_result + pipeline.remove_duplicates(processors_result)
+        exec_duration = time.time() - begin_time
+        logging.info(f'Processing stage finished (exec time {exec_duration:.3f} s)')
+        return combined_result, deferred_outputs
 
-        return processor_results
+    def output_stage_execution(self, processing_stage_result):
+        combined_result, deferred_outputs = processing_stage_result
+        try:
+            for processor, data_chunks in deferred_outputs:
+                processor.execute(data_chunks)
+        finally:
+            release_frame_buffers(combined_result)
 
-    def remove_duplicates(self, data_chunks):
-        return list(dict.fromkeys(data_chunks))
+    @staticmethod
+    def discard_stage_result(stage_result):
+        # Items dropped from the queues of a staged pipeline, either the inlet result or the processing stage result
+        chunks = stage_result[0] if isinstance(stage_result, tuple) else stage_result
+        release_frame_buffers(chunks)
 
     def run(self):
         self.apply_configuration()
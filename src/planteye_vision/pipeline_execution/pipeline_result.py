@@ -0,0 +1,50 @@
+import threading
+import zlib
+from time import monotonic
+
+from planteye_vision.common.frame_buffer_pool import release_frame_buffers
+
+
+class PipelineResult:
+    """
+    This class describes the result of a single pipeline execution: the combined data chunks of inlets and
+    processors, a unique execution id and the timestamp (in milliseconds) of the execution.
+    The result is created when the execution is finished, its age is measured from then on.
+    Serialisation of the result is left to the consumer, e.g. per request in the REST API shell.
+    The content tag identifies the data and statuses of the chunks, results of an unchanged scene share it.
+    Consumers sharing the result hold a lease each (the creator holds the first one), once the last lease is released
+    the pooled frame buffers of the result are free for further captures.
+    """
+    def __init__(self, chunks: list, execution_id: int, timestamp: int):
+        self.chunks = chunks
+        self.execution_id = execution_id
+        self.timestamp = timestamp
+        self.finish_time = monotonic()
+        self._content_tag = None
+        self.leases = 1
+        self.lease_lock = threading.Lock()
+
+    def age(self):
+        return round((monotonic() - self.finish_time) * 1000, 3)
+
+    def retain(self):
+        with self.lease_lock:
+            self.leases += 1
+        return self
+
+    def release(self):
+        with self.lease_lock:
+            self.leases -= 1
+            released = self.leases == 0
+        if released:
+            release_frame_buffers(self.chunks)
+
+    def content_tag(self):
+        # Computed once per result, metadata (e.g. timestamps) differs between executions and is left out
+        if self._content_tag is None:
+            from planteye_vision.pipeline_execution.output_cache import fingerprint_chunks
+            statuses = tuple(tuple((type(status).__name__, status.code) for status in chunk.status)
+                             for chunk in self.chunks)
+            fingerprint = repr((fingerprint_chunks(self.chunks), statuses)).encode('utf-8')
+            self._content_tag = f'{zlib.crc32(fingerprint):08x}{zlib.adler32(fingerprint):08x}'
+        return self._content_tag
@@ -0,0 +1,141 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from planteye_vision.configuration.processor_configuration import ProcessorConfiguration
+from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.data_chunks.data_chunk_status import ProcessorStatus
+from planteye_vision.processors.data_processor import DataProcessor, ConfigurableDataProcessor
+from planteye_vision.processors.processor_factory import create_processor
+
+
+PROCESS_POOL_PROCESSOR_TYPES = ['image_resize', 'image_crop', 'color_conversion', 'pt_inference', 'tf_inference']
+
+_worker_processors = {}
+
+
+class ProcessPoolProcessor(DataProcessor):
+    """
+    This class executes a processor in a worker process of a process pool.
+    Image frames are exchanged with the worker via shared memory blocks, only their descriptors are pickled.
+    """
+    def __init__(self, config: ProcessorConfiguration, process_pool: ProcessPoolExecutor):
+        self.config = config
+        self.name = config.name
+        self.type = config.type
+        self.process_pool = process_pool
+
+    def apply_processor(self, chunks: list):
+        shared_blocks = []
+        try:
+            exported_chunks = export_chunks(chunks, shared_blocks)
+            future = self.process_pool.submit(_execute_in_worker, self.config, exported_chunks)
+            exported_result = future.result()
+        except Exception as exc:
+            logging.error(f'Processor {self.name} ({self.type}): error during execution in worker process',
+                          exc_info=exc)
+            data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
+            data_chunk.add_status(ProcessorStatus(99))
+            return [data_chunk]
+        finally:
+            release_shared_blocks(shared_blocks, unlink=True)
+
+        return import_chunks(exported_result, copy=True)
+
+
+def export_chunks(chunks: list, shared_blocks: list):
+    exported_chunks = []
+    for chunk in chunks:
+        exported_data = []
+        for chunk_data in chunk.data:
+            if isinstance(chunk_data, DataChunkImage) and isinstance(chunk_data.value, np.ndarray):
+                frame_descriptor = _write_shared_frame(chunk_data.value, shared_blocks)
+                exported_data.append(('shared_frame', chunk_data.name, frame_descriptor, chunk_data.data_type))
+            else:
+                exported_data.append(('data', chunk_data))
+        exported_chunks.append((chunk.name, chunk.chunk_type, chunk.parameters, chunk.hidden, exported_data,
+                                chunk.metadata, chunk.status))
+    return exported_chunks
+
+
+def import_chunks(exported_chunks: list, copy: bool, shared_blocks: list = None):
+    chunks = []
+    for name, chunk_type, parameters, hidden, exported_data, metadata, status in exported_chunks:
+        chunk = GeneralDataChunk(name, chunk_type, parameters, hidden=hidden)
+        for exported_data_item in exported_data:
+            if exported_data_item[0] == 'shared_frame':
+                _, data_name, frame_descriptor, data_type = exported_data_item
+                frame = _read_shared_frame(frame_descriptor, copy, shared_blocks)
+                chunk.add_data(DataChunkImage(data_name, frame, data_type, shared=not copy))
+            else:
+                chunk.add_data(exported_data_item[1])
+        [chunk.add_metadata(metadata_item) for metadata_item in metadata]
+        [chunk.add_status(status_item) for status_item in status]
+        chunks.append(chunk)
+    return chunks
+
+
+def release_shared_blocks(shared_blocks: list, unlink: bool):
+    for shared_block in shared_blocks:
+        try:
+            shared_block.close()
+            if unlink:
+                shared_block.unlink()
+        except (BufferError, FileNotFoundError) as exc:
+            logging.debug(f'Shared memory block {shared_block.name} could not be released: {exc}')
+
+
+def _write_shared_frame(frame: np.ndarray, shared_blocks: list):
+    shared_block = shared_memory.SharedMemory(create=True, size=max(frame.nbytes, 1))
+    shared_blocks.append(shared_block)
+    shared_frame = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shared_block.buf)
+    shared_frame[...] = frame
+    del shared_frame
+    return shared_block.name, frame.shape, frame.dtype.str
+
+
+def _read_shared_frame(frame_descriptor: tuple, copy: bool, shared_blocks: list = None):
+    block_name, shape, dtype = frame_descriptor
+    shared_block = shared_memory.SharedMemory(name=block_name)
+    shared_frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shared_block.buf)
+    if not copy:
+        shared_blocks.append(shared_block)
+        return shared_frame
+    frame = shared_frame.copy()
+    del shared_frame
+    shared_block.close()
+    shared_block.unlink()
+    return frame
+
+
+def _get_worker_processor(processor_config: ProcessorConfiguration):
+    processor_key = (processor_config.type, repr(processor_config.cfg_dict))
+    worker_processor = _worker_processors.get(processor_config.name)
+    if worker_processor is None or worker_processor[0] != processor_key:
+        processor = create_processor(processor_config)
+        if isinstance(processor, ConfigurableDataProcessor):
+            processor.apply_configuration()
+        worker_processor = (processor_key, processor)
+        _worker_processors[processor_config.name] = worker_processor
+    return worker_processor[1]
+
+
+def _execute_in_worker(processor_config: ProcessorConfiguration, exported_chunks: list):
+    input_blocks = []
+    output_blocks = []
+    exported_result = None
+    try:
+        chunks = import_chunks(exported_chunks, copy=False, shared_blocks=input_blocks)
+        processor = _get_worker_processor(processor_config)
+        result_chunks = processor.apply_processor(chunks)
+        if isinstance(result_chunks, GeneralDataChunk):
+            result_chunks = [result_chunks]
+        exported_result = export_chunks(result_chunks, output_blocks)
+        del chunks, result_chunks
+    finally:
+        release_shared_blocks(input_blocks, unlink=False)
+        release_shared_blocks(output_blocks, unlink=exported_result is None)
+    return exported_result
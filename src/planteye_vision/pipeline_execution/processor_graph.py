@@ -0,0 +1,227 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from planteye_vision.processors.input_processor import InputProcessor
+from planteye_vision.processors.save_on_disc_processor import SaveOnDiskProcessor
+
+
+class ProcessorGraph:
+    """
+    This class describes processors linked as a directed acyclic graph.
+    Every processor names its upstream nodes (inlets or other processors) in the configuration key "inputs".
+    A processor without "inputs" is linked to the previous processor, the first one is linked to all inlets.
+    Processors whose upstream nodes are finished are executed concurrently on a thread pool.
+    Processors whose output is hidden and not consumed by a live processor are eliminated from the graph,
+    hidden outputs are dropped as soon as all their consumers are finished.
+    """
+    def __init__(self, processors: list, max_workers: int):
+        self.processors = processors
+        self.upstream = {}
+        self.downstream = {}
+        self.valid = True
+        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='processor')
+        self._link_processors()
+
+    def shutdown(self):
+        self.thread_pool.shutdown(wait=False)
+
+    def _link_processors(self):
+        processor_configs = [processor.config for processor in self.processors]
+        if not self.validate(processor_configs):
+            self.valid = False
+            return
+        self.upstream, self.downstream = self.link(processor_configs)
+        self._eliminate_dead_processors()
+
+    @staticmethod
+    def link(processor_configs: list):
+        # Upstream names may be inlets, downstream names are processors only
+        upstream = {}
+        downstream = {}
+        previous_config = None
+        for config in processor_configs:
+            if config.inputs is not None:
+                upstream_names = list(config.inputs)
+            elif previous_config is not None:
+                upstream_names = [previous_config.name]
+            else:
+                upstream_names = []
+            upstream[config.name] = upstream_names
+            downstream[config.name] = []
+            previous_config = config
+
+        for config in processor_configs:
+            for upstream_name in upstream[config.name]:
+                if upstream_name in downstream:
+                    downstream[upstream_name].append(config.name)
+        return upstream, downstream
+
+    @staticmethod
+    def validate(processor_configs: list, inlet_names: list = None):
+        # Unknown upstream names are only detected if the names of the inlets are given
+        processor_names = [config.name for config in processor_configs]
+        if len(set(processor_names)) != len(processor_names):
+            logging.error('Processor graph invalid: processor names are not unique')
+            return False
+
+        upstream, downstream = ProcessorGraph.link(processor_configs)
+        if inlet_names is not None:
+            for name, upstream_names in upstream.items():
+                unknown_names = [upstream_name for upstream_name in upstream_names
+                                 if upstream_name not in downstream and upstream_name not in inlet_names]
+                if len(unknown_names) > 0:
+                    logging.error(f'Processor graph invalid: inputs {", ".join(map(str, unknown_names))} of '
+                                  f'processor {name} are neither inlets nor processors')
+                    return False
+
+        if ProcessorGraph._has_cycle(upstream, downstream):
+            logging.error('Processor graph invalid: processors form a cycle')
+            return False
+        return True
+
+    def _eliminate_dead_processors(self):
+        # Save processors are kept along with their upstream, since they also save chunks passed through
+        live = set()
+        changed = True
+        while changed:
+            changed = False
+            for processor in self.processors:
+                name = processor.config.name
+                if name in live:
+                    continue
+                if isinstance(processor, SaveOnDiskProcessor) \
+                        or (not isinstance(processor, InputProcessor) and not processor.config.hidden) \
+                        or any([downstream_name in live for downstream_name in self.downstream[name]]):
+                    live.add(name)
+                    changed = True
+
+        for processor in self.processors:
+            if processor.config.name not in live:
+                logging.info(f'Processor {processor.name} ({processor.type}) eliminated, its hidden output is not '
+                             f'consumed')
+                self.upstream.pop(processor.config.name)
+                self.downstream.pop(processor.config.name)
+        self.processors = [processor for processor in self.processors if processor.config.name in live]
+        for name in self.downstream:
+            self.downstream[name] = [downstream_name for downstream_name in self.downstream[name]
+                                     if downstream_name in live]
+
+    @staticmethod
+    def _has_cycle(upstream: dict, downstream: dict):
+        dependencies = {name: set([upstream_name for upstream_name in upstream_names if upstream_name in downstream])
+                        for name, upstream_names in upstream.items()}
+        while dependencies:
+            independent = [name for name, deps in dependencies.items() if len(deps) == 0]
+            if len(independent) == 0:
+                return True
+            for name in independent:
+                dependencies.pop(name)
+            for deps in dependencies.values():
+                deps.difference_update(independent)
+        return False
+
+    def _processor_upstream(self, name: str):
+        return [upstream_name for upstream_name in self.upstream[name] if upstream_name in self.downstream]
+
+    def _collect_inputs(self, name: str, inlet_chunks: list, outputs: dict):
+        upstream_names = self.upstream[name]
+        if len(upstream_names) == 0:
+            return list(inlet_chunks)
+        input_chunks = []
+        for upstream_name in upstream_names:
+            if upstream_name in outputs:
+                input_chunks.extend(outputs[upstream_name])
+            else:
+                input_chunks.extend([chunk for chunk in inlet_chunks if chunk.name == upstream_name])
+        return list(dict.fromkeys(input_chunks))
+
+    @staticmethod
+    def _execute_node(processor, input_chunks: list, deferred_outputs: list = None):
+        if isinstance(processor, SaveOnDiskProcessor):
+            if deferred_outputs is not None:
+                deferred_outputs.append((processor, input_chunks))
+            else:
+                processor.execute(input_chunks)
+            return input_chunks
+
+        result = processor.execute(input_chunks)
+        if result is None or len(result) == 0:
+            logging.error(f'Processor {processor.name} returned nothing')
+            return None
+        if isinstance(processor, InputProcessor):
+            return result
+        if any([len(chunk.data) == 0 for chunk in result]):
+            logging.error(f'Processor {processor.name} returned nothing')
+            return None
+        return result
+
+    def execute(self, inlet_chunks: list, deferred_outputs: list = None):
+        if not self.valid:
+            logging.error('Processors execution aborted, processor graph is invalid')
+            return []
+
+        processors_by_name = {processor.config.name: processor for processor in self.processors}
+        waiting_for = {name: set(self._processor_upstream(name)) for name in self.upstream}
+        outputs = {}
+        failed = set()
+        running = {}
+        pending_consumers = {name: len(self.downstream[name]) for name in self.upstream}
+
+        ready = [name for name, deps in waiting_for.items() if len(deps) == 0]
+        while len(ready) > 0 or len(running) > 0:
+            for name in ready:
+                waiting_for.pop(name, None)
+                input_chunks = self._collect_inputs(name, inlet_chunks, outputs)
+                future = self.thread_pool.submit(self._execute_node, processors_by_name[name], input_chunks,
+                                           deferred_outputs)
+                running[future] = name
+            ready = []
+
+            finished, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logging.error(f'Processor {name}: error during execution', exc_info=exc)
+                    result = None
+
+                if result is None:
+                    failed.add(name)
+                else:
+                    outputs[name] = result
+
+                self._consume_upstream(name, pending_consumers, outputs)
+                self._release_downstream(name, waiting_for, failed, ready, pending_consumers, outputs)
+
+        processor_results = []
+        for processor in self.processors:
+            if isinstance(processor, (InputProcessor, SaveOnDiskProcessor)):
+                continue
+            if processor.config.name in outputs:
+                processor_results.extend(outputs[processor.config.name])
+        return processor_results
+
+    def _consume_upstream(self, name: str, pending_consumers: dict, outputs: dict):
+        for upstream_name in [name] + self._processor_upstream(name):
+            if upstream_name != name:
+                pending_consumers[upstream_name] -= 1
+            if pending_consumers[upstream_name] == 0 and upstream_name in outputs:
+                outputs[upstream_name] = [chunk for chunk in outputs[upstream_name] if not chunk.hidden]
+
+    def _release_downstream(self, name: str, waiting_for: dict, failed: set, ready: list, pending_consumers: dict,
+                            outputs: dict):
+        for downstream_name in self.downstream[name]:
+            if downstream_name not in waiting_for:
+                continue
+            waiting_for[downstream_name].discard(name)
+            if len(waiting_for[downstream_name]) > 0:
+                continue
+            waiting_for.pop(downstream_name)
+            if any([upstream_name in failed for upstream_name in self._processor_upstream(downstream_name)]):
+                logging.error(f'Processor {downstream_name} skipped, upstream processor failed')
+                failed.add(downstream_name)
+                self._consume_upstream(downstream_name, pending_consumers, outputs)
+                self._release_downstream(downstream_name, waiting_for, failed, ready, pending_consumers, outputs)
+            else:
+                ready.append(downstream_name)
@@ -4,6 +4,8 @@ from planteye_vision.processors.data_processor import NonConfigurableDataProcess
 
 
 class ChunksToDict(NonConfigurableDataProcessor):
+    metrics_stage = 'encoder'
+
     def __init__(self):
         self.name = 'chunks_to_dict'
         self.type = 'chunks_to_dict'
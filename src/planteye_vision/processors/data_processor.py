@@ -2,17 +2,42 @@ from abc import ABC, abstractmethod
 import time
 import logging
 
+from planteye_vision.common.metrics import metrics, chunks_nbytes, chunks_have_errors
+from planteye_vision.data_chunks.data_chunk_status import ProcessorStatus
+
 
 class DataProcessor(ABC):
+    metrics_stage = 'processor'
+
     @abstractmethod
     def apply_processor(self, input_data):
         pass
 
+    def can_update_configuration(self, config):
+        return False
+
+    def update_configuration(self, config):
+        pass
+
+    def release(self):
+        pass
+
     def execute(self, input_data):
         begin_time = time.time()
         logging.debug(f'Processor {self.name} ({self.type}) execution execution began')
-        processor_result = self.apply_processor(input_data)
+        try:
+            processor_result = self.apply_processor(input_data)
+        except Exception:
+            metrics.record(self.metrics_stage, self.name, self.type, time.time() - begin_time, error=True)
+            raise
         exec_duration = time.time() - begin_time
+        handled_data = processor_result if isinstance(processor_result, list) else input_data
+        # Encoders only reshape chunks, statuses of their result stem from inlets and processors
+        passed_through = input_data if isinstance(input_data, list) else ()
+        error = self.metrics_stage == 'processor' \
+            and chunks_have_errors(processor_result, ProcessorStatus.operation_type, passed_through)
+        metrics.record(self.metrics_stage, self.name, self.type, exec_duration, error=error,
+                       nbytes=chunks_nbytes(handled_data))
         logging.info(f'Processor {self.name} ({self.type}) execution finished (exec time {exec_duration:.3f} s)')
         return processor_result
 
@@ -38,3 +63,32 @@ class ConfigurableDataProcessor(DataProcessor):
     def execute(self, input_data):
         return super().execute(input_data)
 
+
+class StreamingEncoder(NonConfigurableDataProcessor):
+    """
+    This class describes an encoder of the response, which can also produce its result part by part.
+    """
+    metrics_stage = 'encoder'
+
+    @abstractmethod
+    def stream_processor(self, input_data):
+        pass
+
+    def execute_streaming(self, input_data):
+        # Only the time spent in the processor is measured, not the time the consumer needs for every part
+        busy_time = 0
+        nbytes = 0
+        logging.debug(f'Processor {self.name} ({self.type}) streaming execution began')
+        begin_time = time.time()
+        try:
+            for part in self.stream_processor(input_data):
+                busy_time += time.time() - begin_time
+                nbytes += len(part)
+                yield part
+                begin_time = time.time()
+        except Exception:
+            metrics.record(self.metrics_stage, self.name, self.type, busy_time, error=True, nbytes=nbytes)
+            raise
+        busy_time += time.time() - begin_time
+        metrics.record(self.metrics_stage, self.name, self.type, busy_time, nbytes=nbytes)
+        logging.info(f'Processor {self.name} ({self.type}) streaming execution finished (exec time {busy_time:.3f} s)')
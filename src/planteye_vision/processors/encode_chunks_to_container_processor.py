@@ -0,0 +1,69 @@
+import logging
+
+import numpy as np
+
+from planteye_vision.common.encoding_pool import ordered_map
+from planteye_vision.data_chunks.data_chunk_container import pack_container, iterate_container, CONTAINER_VERSION
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
+from planteye_vision.processors.data_processor import StreamingEncoder
+
+
+class EncodeChunksToContainer(StreamingEncoder):
+    """
+    This class encodes data chunks into a binary container: a JSON header as in the JSON response, but with image
+    frames as binary buffers (png, jpeg, webp or raw) instead of base64 strings.
+    When streamed, every frame is encoded only when its buffer is written and the encoding is not memoised.
+    If fields are given, only these fields of every chunk are written to the header.
+    """
+    def __init__(self, image_format: str = 'png', level: int = None, encoding_pool=None, metadata: dict = None,
+                 fields: list = None):
+        self.name = 'container_encode'
+        self.type = 'container_encode'
+        self.image_format = image_format
+        self.level = level
+        self.encoding_pool = encoding_pool
+        self.metadata = metadata or {}
+        self.fields = fields
+
+    def apply_processor(self, chunks: list):
+        header, images = self.layout_container(chunks)
+        buffers = list(ordered_map(self.encoding_pool, lambda image: image.encode(self.image_format, self.level),
+                                   images))
+        logging.debug(f'Processor {self.name} ({self.type}): execution successful')
+        return pack_container(header, buffers)
+
+    def stream_processor(self, chunks: list):
+        header, images = self.layout_container(chunks)
+        buffers = ordered_map(self.encoding_pool, lambda image: image.encode(self.image_format, self.level, False),
+                              images)
+        return iterate_container(header, buffers)
+
+    def layout_container(self, chunks: list):
+        images = []
+        chunks_dict = {}
+        for chunk in chunks:
+            if chunk.hidden:
+                continue
+            chunk_dict = chunk.as_dict()
+            for metadata_name, metadata_value in self.metadata.items():
+                chunk_dict['metadata'].update(MetadataChunkData(metadata_name, metadata_value).as_dict())
+            for chunk_data in chunk.data:
+                if not isinstance(chunk_data, DataChunkImage) or not isinstance(chunk_data.value, np.ndarray):
+                    continue
+                data_dict = {'name': chunk_data.name, 'type': chunk_data.data_type, 'encoding': self.image_format,
+                             'buffer': len(images)}
+                if self.image_format == 'raw':
+                    data_dict['shape'] = list(chunk_data.value.shape)
+                    data_dict['dtype'] = chunk_data.value.dtype.str
+                images.append(chunk_data)
+                chunk_dict['data'][chunk_data.name] = data_dict
+            if self.fields is not None:
+                chunk_dict = {field: value for field, value in chunk_dict.items() if field in self.fields}
+            chunks_dict[chunk.name] = chunk_dict
+
+        header = {'version': CONTAINER_VERSION, 'buffers': len(images), 'chunks': chunks_dict}
+        return header, images
+
+    def execute(self, input_data):
+        return super().execute(input_data)
@@ -0,0 +1,84 @@
+import json
+import logging
+import re
+
+import numpy as np
+
+from planteye_vision.common.encoding_pool import ordered_map
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.data_chunks.metadata_chunk import MetadataChunkData
+from planteye_vision.processors.data_processor import StreamingEncoder
+
+
+IMAGE_PLACEHOLDER = '\x00planteye_image_%d\x00'
+IMAGE_PLACEHOLDER_PATTERN = re.compile(r'"\\u0000planteye_image_(\d+)\\u0000"')
+
+
+class EncodeChunksToJson(StreamingEncoder):
+    """
+    This class encodes data chunks into the JSON response with base64 encoded images (png, jpeg or webp).
+    The JSON text is produced in parts, one chunk after another with every image encoded only when it is written,
+    so that a streamed response only holds the frames encoded ahead by the encoding pool.
+    Metadata given per response (e.g. the age of the result) is added to every chunk without changing the chunks.
+    If fields are given, only these fields of every chunk (e.g. data and status) are written.
+    """
+    def __init__(self, image_format: str = 'png', level: int = None, memoise: bool = True, encoding_pool=None,
+                 metadata: dict = None, fields: list = None):
+        self.name = 'json_encode'
+        self.type = 'json_encode'
+        self.image_format = image_format
+        self.level = level
+        self.memoise = memoise
+        self.encoding_pool = encoding_pool
+        self.metadata = metadata or {}
+        self.fields = fields
+
+    def apply_processor(self, chunks: list):
+        result = ''.join(self.stream_processor(chunks))
+        logging.debug(f'Processor {self.name} ({self.type}): execution successful')
+        return result
+
+    def stream_processor(self, chunks: list):
+        # Chunks with the same name replace each other as in ChunksToDict
+        chunks_by_name = {}
+        for chunk in chunks:
+            if not chunk.hidden:
+                chunks_by_name[chunk.name] = chunk
+
+        # All chunks are laid out first, so that the images of all chunks can be encoded in parallel
+        chunks_json_parts = []
+        images = []
+        for chunk_name, chunk in chunks_by_name.items():
+            chunk_dict = chunk.as_dict()
+            for metadata_name, metadata_value in self.metadata.items():
+                chunk_dict['metadata'].update(MetadataChunkData(metadata_name, metadata_value).as_dict())
+            chunk_images = []
+            for chunk_data in chunk.data:
+                if isinstance(chunk_data, DataChunkImage) and isinstance(chunk_data.value, np.ndarray):
+                    data_dict = chunk_dict['data'][chunk_data.name]
+                    data_dict['value'] = IMAGE_PLACEHOLDER % len(chunk_images)
+                    if chunk_data.data_type.startswith('base64_'):
+                        data_dict['type'] = 'base64_' + self.image_format
+                    chunk_images.append(chunk_data)
+            if self.fields is not None:
+                chunk_dict = {field: value for field, value in chunk_dict.items() if field in self.fields}
+            chunk_json_parts = IMAGE_PLACEHOLDER_PATTERN.split(json.dumps(chunk_dict))
+            # Only images whose placeholder is written are encoded, in the order of their placeholders
+            images.extend([chunk_images[int(image_index)] for image_index in chunk_json_parts[1::2]])
+            chunks_json_parts.append((chunk_name, chunk_json_parts))
+
+        encodings = ordered_map(self.encoding_pool, self.encode_image, images)
+        yield '{'
+        for index, (chunk_name, chunk_json_parts) in enumerate(chunks_json_parts):
+            yield (', ' if index > 0 else '') + json.dumps(chunk_name) + ': '
+            yield chunk_json_parts[0]
+            for chunk_json_part in chunk_json_parts[2::2]:
+                yield '"' + next(encodings) + '"'
+                yield chunk_json_part
+        yield '}'
+
+    def encode_image(self, image: DataChunkImage):
+        return image.encode_as_base64(self.image_format, self.level, self.memoise)
+
+    def execute(self, input_data):
+        return super().execute(input_data)
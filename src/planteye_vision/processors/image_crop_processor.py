@@ -2,7 +2,6 @@ import logging
 
 from planteye_vision.configuration.processor_configuration import ImageCropProcessorConfiguration
 from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
-from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
 from planteye_vision.data_chunks.data_chunk_status import ProcessorStatus
 from planteye_vision.processors.data_processor import ConfigurableDataProcessor
 
@@ -40,18 +39,18 @@ class ImageCrop(ConfigurableDataProcessor):
                 y_end = int(self.y_init + self.y_diff)
 
                 try:
-                    image_np = chunk.data[0].value
-                    image_dims = len(image_np.shape)
+                    image = chunk.data[0]
+                    image_dims = len(image.value.shape)
                     if image_dims == 3:
-                        value = image_np[self.x_init:x_end, self.y_init:y_end, :]
+                        region = (slice(self.x_init, x_end), slice(self.y_init, y_end), slice(None))
                     elif image_dims == 2:
-                        value = image_np[self.x_init:x_end, self.y_init:y_end]
+                        region = (slice(self.x_init, x_end), slice(self.y_init, y_end))
                     else:
                         raise BaseException
                     status = ProcessorStatus(0)
                     data_type = 'image'
                     data_chunk.add_status(status)
-                    data_chunk.add_data(DataChunkImage('frame', value, data_type))
+                    data_chunk.add_data(image.view(region, 'frame', data_type))
                     logging.debug(f'Processor {self.name} ({self.type}): execution successful')
                 except Exception:
                     status = ProcessorStatus(99)
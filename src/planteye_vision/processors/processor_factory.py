@@ -0,0 +1,30 @@
+import logging
+
+from planteye_vision.configuration.processor_configuration import ProcessorConfiguration
+from planteye_vision.processors.image_color_conversion_processor import ImageColorConversion
+from planteye_vision.processors.image_crop_processor import ImageCrop
+from planteye_vision.processors.image_resize_processor import ImageResize
+from planteye_vision.processors.input_processor import InputProcessor
+from planteye_vision.processors.save_on_disc_processor import SaveOnDiskProcessor
+
+
+def create_processor(processor_config: ProcessorConfiguration):
+    if processor_config.type == 'input':
+        return InputProcessor(processor_config)
+    elif processor_config.type == 'image_resize':
+        return ImageResize(processor_config)
+    elif processor_config.type == 'image_crop':
+        return ImageCrop(processor_config)
+    elif processor_config.type == 'color_conversion':
+        return ImageColorConversion(processor_config)
+    elif processor_config.type == 'tf_inference':
+        from planteye_vision.processors.tf_model_inference_processor import TFModelInference
+        return TFModelInference(processor_config)
+    elif processor_config.type == 'pt_inference':
+        from planteye_vision.processors.pt_model_inference_processor import PTModelInference
+        return PTModelInference(processor_config)
+    elif processor_config.type == 'save_on_disk':
+        return SaveOnDiskProcessor(processor_config)
+    else:
+        logging.error('Unsupported processor type %s' % processor_config.type)
+        return None
@@ -0,0 +1,61 @@
+import logging
+
+import cv2
+import numpy as np
+
+from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.processors.data_processor import NonConfigurableDataProcessor
+
+
+CHUNK_FIELDS = ['type', 'name', 'parameters', 'data', 'metadata', 'status']
+
+
+class ProjectChunks(NonConfigurableDataProcessor):
+    """
+    This class selects the chunks, fields and images a client asked for, before the chunks are serialised.
+    The projected chunks are new objects referring to the data of the original chunks, which stay unchanged.
+    Images that are not selected are dropped and thus never encoded, larger images are scaled down.
+    """
+    metrics_stage = 'encoder'
+
+    def __init__(self, chunk_names: list = None, fields: list = None, images: bool = True,
+                 max_image_size: int = None):
+        self.name = 'project_chunks'
+        self.type = 'project_chunks'
+        self.chunk_names = chunk_names
+        self.fields = fields if fields is not None else CHUNK_FIELDS
+        self.images = images
+        self.max_image_size = max_image_size
+
+    def apply_processor(self, chunks: list):
+        projected_chunks = []
+        for chunk in chunks:
+            if chunk.hidden or (self.chunk_names is not None and chunk.name not in self.chunk_names):
+                continue
+            projected_chunk = GeneralDataChunk(chunk.name, chunk.chunk_type, chunk.parameters)
+            if 'data' in self.fields:
+                projected_chunk.data = [self.project_data(chunk_data) for chunk_data in chunk.data
+                                        if self.images or not isinstance(chunk_data, DataChunkImage)]
+            if 'metadata' in self.fields:
+                projected_chunk.metadata = chunk.metadata
+            if 'status' in self.fields:
+                projected_chunk.status = chunk.status
+            projected_chunks.append(projected_chunk)
+        logging.debug(f'Processor {self.name} ({self.type}): execution successful')
+        return projected_chunks
+
+    def project_data(self, chunk_data):
+        if self.max_image_size is None or not isinstance(chunk_data, DataChunkImage) \
+                or not isinstance(chunk_data.value, np.ndarray):
+            return chunk_data
+        height, width = chunk_data.value.shape[:2]
+        scale = self.max_image_size / max(height, width)
+        if scale >= 1:
+            return chunk_data
+        size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+        return DataChunkImage(chunk_data.name, cv2.resize(chunk_data.value, size, interpolation=cv2.INTER_AREA),
+                              chunk_data.data_type)
+
+    def execute(self, input_data):
+        return super().execute(input_data)
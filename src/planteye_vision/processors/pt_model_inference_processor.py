@@ -1,7 +1,7 @@
 import logging
 import os
 import numpy as np
-from planteye_vision.configuration.processor_configuration import TFModelInferenceProcessorConfiguration
+from planteye_vision.configuration.processor_configuration import PTModelInferenceProcessorConfiguration
 from planteye_vision.data_chunks.data_chunk import GeneralDataChunk
 from planteye_vision.data_chunks.data_chunk_data import DataChunkValue
 from planteye_vision.data_chunks.data_chunk_status import ProcessorStatus
@@ -10,7 +10,7 @@ import torch
 
 
 class PTModelInference(ConfigurableDataProcessor):
-    def __init__(self, config: TFModelInferenceProcessorConfiguration):
+    def __init__(self, config: PTModelInferenceProcessorConfiguration):
         self.config = config
         self.name = None
         self.type = None
@@ -33,6 +33,19 @@ class PTModelInference(ConfigurableDataProcessor):
         except Exception as exc:
             logging.error(f'Processor {self.name} ({self.type}): no pt model could be loaded: {exc}')
 
+    def can_update_configuration(self, config: PTModelInferenceProcessorConfiguration):
+        if self.model is None or not config.is_valid():
+            return False
+        for parameter in ['path_to_models', 'model_name', 'model_version']:
+            if config.parameters[parameter] != self.config.parameters[parameter]:
+                return False
+        return True
+
+    def update_configuration(self, config: PTModelInferenceProcessorConfiguration):
+        self.config = config
+        self.name = self.config.name
+        self.type = self.config.type
+
     def apply_processor(self, data_chunks):
         image_np = data_chunks[0].data[0].value
         data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
@@ -2,10 +2,11 @@ import json
 import logging
 import os
 
-import cv2
+import numpy as np
+
 from planteye_vision.common.timestamp import get_timestamp
 from planteye_vision.configuration.processor_configuration import SaveOnDiskProcessorConfiguration
-from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage, IMAGE_CODECS
 from planteye_vision.processors.data_processor import ConfigurableDataProcessor
 
 
@@ -28,6 +29,10 @@ class SaveOnDiskProcessor(ConfigurableDataProcessor):
             return None
 
         timestamp = get_timestamp()
+        image_format = self.config.image_encoding.image_format
+        level = self.config.image_encoding.level
+        # Raw frames are saved as numpy files, so that their shape and data type are kept
+        extension = IMAGE_CODECS[image_format][0] if image_format in IMAGE_CODECS else '.npy'
         json_dict = {}
         for chunk in data_chunks:
             if chunk.hidden:
@@ -39,15 +44,19 @@ class SaveOnDiskProcessor(ConfigurableDataProcessor):
                 chunk_dict.pop('data')
                 chunk_dict['data'] = []
                 for image in chunk.data:
-                    if isinstance(image, DataChunkImage) and chunk.data[0].value is not None:
-                        image_file_name = str(timestamp) + '_' + chunk.name + '_' + image.name + '.png'
+                    if isinstance(image, DataChunkImage) and image.value is not None:
+                        image_file_name = str(timestamp) + '_' + chunk.name + '_' + image.name + extension
                         image_file_full_path = os.path.join(self.config.parameters['save_path'], image_file_name)
-                        ret_val = cv2.imwrite(image_file_full_path, chunk.data[0].value)
                         chunk_dict['data'].append({image.name: image_file_name})
-                        if ret_val:
+                        try:
+                            with open(image_file_full_path, 'wb') as image_file:
+                                if image_format == 'raw':
+                                    np.save(image_file, image.value)
+                                else:
+                                    image_file.write(image.encode(image_format, level))
                             logging.info(f'Data saved as {image_file_full_path}')
-                        else:
-                            logging.info(f'Data NOT saved as {image_file_full_path}')
+                        except Exception as exc:
+                            logging.info(f'Data NOT saved as {image_file_full_path}: {exc}')
 
             json_dict[chunk.name] = chunk_dict
 
@@ -34,6 +34,19 @@ class TFModelInference(ConfigurableDataProcessor):
         except Exception as exc:
             logging.error(f'Processor {self.name} ({self.type}): no tf model can be loaded: {exc}')
 
+    def can_update_configuration(self, config: TFModelInferenceProcessorConfiguration):
+        if self.tf_model is None or not config.is_valid():
+            return False
+        for parameter in ['path_to_models', 'model_name', 'model_version']:
+            if config.parameters[parameter] != self.config.parameters[parameter]:
+                return False
+        return True
+
+    def update_configuration(self, config: TFModelInferenceProcessorConfiguration):
+        self.config = config
+        self.name = self.config.name
+        self.type = self.config.type
+
     def apply_processor(self, data_chunks):
         image_np = data_chunks[0].data[0].value
         data_chunk = GeneralDataChunk(self.name, self.type, self.config.parameters, hidden=self.config.hidden)
@@ -0,0 +1,62 @@
+import logging
+import threading
+from collections import deque
+
+
+class EventPublisher:
+    """
+    This class pushes every new pipeline result to its subscribers as server-sent events.
+    Every subscriber has a bounded queue of its own, a subscriber that does not keep up loses its oldest results,
+    so publishing never waits for a subscriber and never stalls the pipeline.
+    A result is serialised once per selection of chunks and images when it is published, all subscribers with the
+    same selection share the serialised event.
+    """
+    def __init__(self, serializer: callable, queue_size: int = 4, heartbeat_interval: float = 15):
+        self.serializer = serializer
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.condition = threading.Condition()
+        self.subscribers = []
+
+    def publish(self, result):
+        with self.condition:
+            selections = set([selection for selection, _ in self.subscribers])
+        if len(selections) == 0:
+            return
+        # Serialised outside of the lock, subscribers keep only the serialised events, not the result
+        events = {}
+        for selection in selections:
+            chunk_names, images = selection
+            chunks = [chunk for chunk in result.chunks if chunk_names is None or chunk.name in chunk_names]
+            events[selection] = (result.execution_id, self.serializer(chunks, images))
+        with self.condition:
+            for selection, subscriber in self.subscribers:
+                if selection not in events:
+                    continue
+                if len(subscriber) == subscriber.maxlen:
+                    logging.debug(f'Subscriber too slow, result {subscriber[0][0]} dropped')
+                subscriber.append(events[selection])
+            self.condition.notify_all()
+
+    def events(self, chunk_names: list = None, images: bool = False):
+        selection = (tuple(chunk_names) if chunk_names is not None else None, images)
+        subscription = (selection, deque(maxlen=self.queue_size))
+        subscriber = subscription[1]
+        with self.condition:
+            self.subscribers.append(subscription)
+        try:
+            yield 'retry: 1000\n\n'
+            while True:
+                with self.condition:
+                    if len(subscriber) == 0:
+                        self.condition.wait(self.heartbeat_interval)
+                    event = subscriber.popleft() if len(subscriber) > 0 else None
+                if event is None:
+                    # Comment line, lets the server notice disconnected subscribers
+                    yield ': heartbeat\n\n'
+                    continue
+                execution_id, data = event
+                yield f'id: {execution_id}\nevent: result\ndata: {data}\n\n'
+        finally:
+            with self.condition:
+                self.subscribers.remove(subscription)
@@ -0,0 +1,65 @@
+import logging
+import threading
+from time import monotonic
+
+
+class ExecutionCoalescer:
+    """
+    This class coalesces concurrent requests for a pipeline execution (single flight).
+    Requests arriving while an execution is ongoing wait for it and share its result.
+    Additionally, a result that is not older than the freshness window (in milliseconds) is returned without
+    any new execution.
+    Every returned result is retained for its caller, who releases it once done with it; the coalescer itself holds
+    the latest result until a new one replaces it.
+    """
+    def __init__(self, callback: callable, freshness_window: float = 0):
+        self.callback = callback
+        self.freshness_window = freshness_window
+        self.condition = threading.Condition()
+        self.ongoing = False
+        self.generation = 0
+        self.latest_result = None
+        self.latest_error = None
+        self.latest_result_time = None
+
+    def execute(self):
+        with self.condition:
+            if self._latest_result_is_fresh():
+                logging.debug('Fresh result of previous execution returned')
+                return self.latest_result.retain()
+            if self.ongoing:
+                generation = self.generation
+                while self.generation == generation:
+                    self.condition.wait()
+                logging.debug('Result of concurrent execution shared')
+                if self.latest_error is not None:
+                    raise self.latest_error
+                return self.latest_result.retain() if self.latest_result is not None else None
+            self.ongoing = True
+
+        result = None
+        error = None
+        try:
+            result = self.callback()
+        except Exception as exc:
+            error = exc
+
+        with self.condition:
+            previous_result = self.latest_result
+            self.latest_result = result.retain() if result is not None else None
+            self.latest_error = error
+            self.latest_result_time = monotonic()
+            self.generation += 1
+            self.ongoing = False
+            self.condition.notify_all()
+        if previous_result is not None:
+            previous_result.release()
+
+        if error is not None:
+            raise error
+        return result
+
+    def _latest_result_is_fresh(self):
+        if self.freshness_window <= 0 or self.latest_result is None or self.latest_error is not None:
+            return False
+        return (monotonic() - self.latest_result_time) * 1000 <= self.freshness_window
@@ -0,0 +1,117 @@
+import logging
+import threading
+from time import monotonic, sleep
+
+import numpy as np
+
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage
+
+
+MULTIPART_BOUNDARY = 'planteye_frame'
+
+
+class FrameBroadcaster:
+    """
+    This class runs one capture loop at a given rate for all viewers of a frame stream (MJPEG).
+    Every captured frame is encoded once as jpeg and published to all viewers, a viewer that is too slow skips frames
+    and always receives the latest one. The loop only runs while at least one viewer is subscribed.
+    If no new frame is published within the keep-alive interval, the latest frame is sent again, so that disconnected
+    viewers are noticed; if there is no frame at all (e.g. no image chunk), the stream is closed.
+    """
+    def __init__(self, result_callback: callable, fps: float, chunk_name: str = None, quality: int = None,
+                 keepalive_interval: float = 15):
+        self.result_callback = result_callback
+        self.fps = fps
+        self.chunk_name = chunk_name
+        self.quality = quality
+        self.keepalive_interval = keepalive_interval
+        self.condition = threading.Condition()
+        self.viewers = 0
+        self.thread = None
+        self.frame = None
+        self.frame_id = 0
+        self.execution_id = None
+
+    def stream(self):
+        self._subscribe()
+        try:
+            frame_id = 0
+            while True:
+                with self.condition:
+                    if self.frame_id == frame_id or self.frame is None:
+                        self.condition.wait(self.keepalive_interval)
+                    if self.frame is None:
+                        logging.warning('Frame stream closed, no frame available')
+                        return
+                    frame_id = self.frame_id
+                    frame = self.frame
+                yield (f'--{MULTIPART_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n'
+                       .encode('ascii') + frame + b'\r\n')
+        finally:
+            self._unsubscribe()
+
+    def _subscribe(self):
+        with self.condition:
+            self.viewers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._capture_loop, name='frame_broadcaster', daemon=True)
+                self.thread.start()
+                logging.info('Frame stream capture loop started')
+
+    def _unsubscribe(self):
+        with self.condition:
+            self.viewers -= 1
+
+    def _capture_loop(self):
+        interval = 1.0 / self.fps
+        next_capture = monotonic()
+        while True:
+            with self.condition:
+                if self.viewers == 0:
+                    self.thread = None
+                    self.frame = None
+                    self.execution_id = None
+                    logging.info('Frame stream capture loop stopped, no viewers left')
+                    return
+
+            result = None
+            try:
+                result = self.result_callback()
+                if result is None or result.execution_id == self.execution_id:
+                    # No new result yet (e.g. shared latest result of a background loop), nothing to publish
+                    encoded = None
+                else:
+                    self.execution_id = result.execution_id
+                    frame = self.select_frame(result.chunks)
+                    encoded = frame.encode('jpeg', self.quality) if frame is not None else None
+                    if encoded is None:
+                        logging.warning('Frame stream: no frame found in pipeline result')
+            except Exception as exc:
+                logging.error('Frame stream capture failed', exc_info=exc)
+                encoded = None
+            finally:
+                # Only the encoded frame is kept, the result is not needed any more
+                if result is not None:
+                    result.release()
+
+            if encoded is not None:
+                with self.condition:
+                    self.frame = encoded
+                    self.frame_id += 1
+                    self.condition.notify_all()
+
+            next_capture += interval
+            remaining = next_capture - monotonic()
+            if remaining > 0:
+                sleep(remaining)
+            else:
+                next_capture = monotonic()
+
+    def select_frame(self, chunks: list):
+        for chunk in chunks:
+            if chunk.hidden or (self.chunk_name is not None and chunk.name != self.chunk_name):
+                continue
+            for chunk_data in chunk.data:
+                if isinstance(chunk_data, DataChunkImage) and isinstance(chunk_data.value, np.ndarray):
+                    return chunk_data
+        return None
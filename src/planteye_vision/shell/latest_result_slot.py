@@ -0,0 +1,26 @@
+import threading
+
+
+class LatestResultSlot:
+    """
+    This class holds the latest finished pipeline result of a background loop.
+    Readers get the result without waiting for any execution, only before the first result they wait for it.
+    The slot takes over the lease of a put result, readers get a lease of their own and release it when done.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.result = None
+
+    def put(self, result):
+        with self.condition:
+            previous_result = self.result
+            self.result = result
+            self.condition.notify_all()
+        if previous_result is not None:
+            previous_result.release()
+
+    def get(self, timeout: float = None):
+        with self.condition:
+            if self.result is None:
+                self.condition.wait_for(lambda: self.result is not None, timeout)
+            return self.result.retain() if self.result is not None else None
@@ -1,7 +1,9 @@
 import logging
 import threading
+from queue import Queue, Full, Empty
 from time import time, sleep
 
+from planteye_vision.common.frame_buffer_pool import release_frame_buffers
 from planteye_vision.shell.shell import Shell
 from planteye_vision.configuration.shell_configuration import PeriodicalLocalShellConfiguration
 
@@ -13,21 +15,39 @@ class PeriodicalLocalShell(Shell):
     def __init__(self, config: PeriodicalLocalShellConfiguration):
         self.config = config
         self.time_scheduler = None
+        self.staged_pipeline = None
         self.callback = None
         self.silent_callback = None
+        self.stage_callbacks = None
 
     def apply_configuration(self):
-        self.time_scheduler = TimeScheduler(self.config.parameters['time_interval'], self.execution_step)
+        if self.config.parameters['pipeline_mode'] == 'staged' and self.stage_callbacks is not None:
+            capture_callback, processing_callback, output_callback, discard_callback = self.stage_callbacks
+            self.staged_pipeline = StagedPipeline(capture_callback, processing_callback, output_callback,
+                                                  self.config.parameters['queue_size'],
+                                                  self.config.parameters['queue_policy'], discard_callback)
+            self.staged_pipeline.start()
+            self.time_scheduler = TimeScheduler(self.config.parameters['time_interval'],
+                                                self.staged_pipeline.capture_step)
+        else:
+            self.time_scheduler = TimeScheduler(self.config.parameters['time_interval'], self.execution_step)
         self.time_scheduler.start()
 
     def attach_callback(self, callback):
         self.callback = callback
 
+    def attach_stage_callbacks(self, capture_callback, processing_callback, output_callback,
+                               discard_callback=None):
+        self.stage_callbacks = (capture_callback, processing_callback, output_callback, discard_callback)
+
     def attach_silent_execution_callback(self, callback):
         pass
 
     def execution_step(self):
-        self.callback()
+        chunks = self.callback()
+        # Results are saved by the pipeline itself, their frame buffers are free for the next capture
+        if isinstance(chunks, list):
+            release_frame_buffers(chunks)
 
 
 class TimeScheduler:
@@ -60,3 +80,84 @@ class TimeScheduler:
                 logging.warning(warn_msg)
             else:
                 sleep(max(expected_step_end-time(), 0))
+
+
+class StagedPipeline:
+    """
+    This class runs the capturing, processing and output stages of the pipeline in their own threads.
+    The stages are decoupled by bounded queues, so the throughput is limited by the slowest stage only.
+    If a queue is full, either the oldest queued item is dropped (drop_oldest) or the previous stage waits (block).
+    Dropped items are passed to the discard callback, e.g. to release their frame buffers.
+    """
+    def __init__(self, capture_callback, processing_callback, output_callback, queue_size: int = 1,
+                 queue_policy: str = 'drop_oldest', discard_callback=None):
+        self.capture_callback = capture_callback
+        self.processing_callback = processing_callback
+        self.output_callback = output_callback
+        self.discard_callback = discard_callback
+        self.queue_policy = queue_policy
+        self.processing_queue = Queue(maxsize=queue_size)
+        self.output_queue = Queue(maxsize=queue_size)
+        self.threads = []
+        self.stop_flag = False
+
+    def start(self):
+        self.stop_flag = False
+        self.threads = [
+            threading.Thread(target=self._stage_loop, args=[self.processing_queue, self._processing_step]),
+            threading.Thread(target=self._stage_loop, args=[self.output_queue, self.output_callback]),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stop_flag = True
+
+    def capture_step(self):
+        captured = self.capture_callback()
+        if captured is None:
+            return
+        self._enqueue(self.processing_queue, captured, 'processing')
+
+    def _processing_step(self, captured):
+        processed = self.processing_callback(captured)
+        if processed is None:
+            return
+        self._enqueue(self.output_queue, processed, 'output')
+
+    def _enqueue(self, queue: Queue, item, stage_name: str):
+        if self.queue_policy == 'block':
+            while not self.stop_flag:
+                try:
+                    queue.put(item, timeout=0.1)
+                    return
+                except Full:
+                    continue
+            self._discard(item)
+            return
+
+        while True:
+            try:
+                queue.put_nowait(item)
+                return
+            except Full:
+                try:
+                    self._discard(queue.get_nowait())
+                    logging.warning(f'Queue of {stage_name} stage full, oldest item dropped')
+                except Empty:
+                    pass
+
+    def _discard(self, item):
+        if self.discard_callback is not None:
+            self.discard_callback(item)
+
+    def _stage_loop(self, queue: Queue, stage_function):
+        while not self.stop_flag:
+            try:
+                item = queue.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                stage_function(item)
+            except Exception as exc:
+                logging.error('Pipeline stage execution failed', exc_info=exc)
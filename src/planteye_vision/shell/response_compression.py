@@ -0,0 +1,20 @@
+import zlib
+
+
+# Window bits of zlib for the content codings of HTTP: gzip container or zlib container (deflate)
+CONTENT_ENCODINGS = {'gzip': 31, 'deflate': 15}
+
+
+def compress_parts(parts, content_encoding: str, level: int = 6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, CONTENT_ENCODINGS[content_encoding])
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        compressed = compressor.compress(part)
+        if len(compressed) > 0:
+            yield compressed
+    yield compressor.flush()
+
+
+def compress(payload, content_encoding: str, level: int = 6):
+    return b''.join(compress_parts([payload], content_encoding, level))
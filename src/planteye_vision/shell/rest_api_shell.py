@@ -1,8 +1,25 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import logging
 import threading
+import uuid
+import zlib
 
+import numpy as np
+
+from planteye_vision.common.encoding_pool import EncodingPool
+from planteye_vision.common.metrics import metrics
+from planteye_vision.data_chunks.data_chunk_container import CONTAINER_MEDIA_TYPE
+from planteye_vision.data_chunks.data_chunk_data import DataChunkImage, IMAGE_FORMATS
+from planteye_vision.processors.encode_chunks_to_container_processor import EncodeChunksToContainer
+from planteye_vision.processors.encode_chunks_to_json_processor import EncodeChunksToJson
+from planteye_vision.processors.project_chunks_processor import ProjectChunks, CHUNK_FIELDS
 from planteye_vision.shell.shell import Shell
+from planteye_vision.shell.event_publisher import EventPublisher
+from planteye_vision.shell.execution_coalescer import ExecutionCoalescer
+from planteye_vision.shell.frame_broadcaster import FrameBroadcaster, MULTIPART_BOUNDARY
+from planteye_vision.shell.latest_result_slot import LatestResultSlot
+from planteye_vision.shell.periodical_local_shell import TimeScheduler
+from planteye_vision.shell.response_compression import CONTENT_ENCODINGS, compress, compress_parts
 from planteye_vision.configuration.shell_configuration import RestAPIShellConfiguration
 from planteye_vision.configuration.planteye_configuration import PlantEyeConfiguration
 
@@ -10,13 +27,40 @@ from planteye_vision.configuration.planteye_configuration import PlantEyeConfigu
 class RestAPIShell(Shell):
     """
     This class describes an REST API shell
+    The pipeline result is serialised per request, either as JSON with base64 encoded images or, if the client
+    accepts it, as binary container with raw or compressed image buffers.
+    The image encoding is configured per shell, clients can choose another one via query parameters or by ranking
+    image media types above the response media type in the Accept header.
+    Viewers of the endpoint /stream receive jpeg frames (MJPEG) of one capture loop shared by all viewers.
+    Subscribers of the endpoint /events receive every new pipeline result as server-sent event.
+    In background mode, the pipeline is executed periodically and requests are served from the latest result.
+    Images are encoded in parallel on a pool of encoding workers.
+    Responses carry an ETag of the result content and the requested variant, a client sending it as If-None-Match
+    gets 304 as long as data and statuses of the result are unchanged, the response is then neither encoded nor sent.
+    JSON responses without images are compressed if the client accepts it.
+    Clients can select chunks, fields and images of the response via query parameters, images that are not selected
+    are never encoded.
     """
+    JSON_MEDIA_TYPE = 'application/json'
+    # Time in seconds a request waits for the first result of the background loop
+    FIRST_RESULT_TIMEOUT = 30
+    JSON_IMAGE_FORMATS = ['png', 'jpeg', 'webp']
+    CONTAINER_IMAGE_FORMATS = IMAGE_FORMATS
+    IMAGE_MEDIA_TYPES = {'image/png': 'png', 'image/jpeg': 'jpeg', 'image/webp': 'webp'}
 
     def __init__(self, config: RestAPIShellConfiguration):
         self.config = config
+        # Execution ids start at 1 with every start of PlantEye, so ETags of different runs must differ
+        self.instance_id = uuid.uuid4().hex[:8]
         self.webserver = None
         self.webserver_thread = None
-        self.response_callback = None
+        self.execution_callback = None
+        self.coalescer = None
+        self.encoding_pool = None
+        self.frame_broadcaster = None
+        self.event_publisher = None
+        self.latest_result_slot = None
+        self.background_scheduler = None
         self.silent_execution_callback = None
         self.planteye_config = None
         self.pipeline_executor = None
@@ -24,7 +68,23 @@ class RestAPIShell(Shell):
     def apply_configuration(self):
         host = self.config.parameters['host']
         port = self.config.parameters['port']
-        self.webserver = RestAPIWebserver('PlantEye', host, port)
+        server_options = {option: self.config.parameters[option]
+                          for option in ['threads', 'connection_limit', 'backlog', 'channel_timeout']}
+        self.webserver = RestAPIWebserver('PlantEye', host, port, self.config.parameters['server'], server_options)
+
+        self.event_publisher = EventPublisher(self.serialize_event, self.config.parameters['events_queue_size'])
+        self.coalescer = ExecutionCoalescer(self.publishing_execution, self.config.parameters['freshness_window'])
+        self.encoding_pool = EncodingPool(self.config.parameters['encoding_workers'])
+        image_encoding = self.config.image_encoding
+        stream_quality = image_encoding.level if image_encoding.image_format == 'jpeg' else None
+        self.frame_broadcaster = FrameBroadcaster(self.latest_result, self.config.parameters['stream_fps'],
+                                                  self.config.parameters['stream_chunk'], stream_quality)
+
+        if self.config.parameters['mode'] == 'background':
+            self.latest_result_slot = LatestResultSlot()
+            self.background_scheduler = TimeScheduler(self.config.parameters['time_interval'],
+                                                      self.background_execution)
+            self.background_scheduler.start()
 
         endpoint = self.config.parameters['endpoint']
         endpoint_name = 'PlantEye REST API Shell'
@@ -32,6 +92,9 @@ class RestAPIShell(Shell):
         self.webserver.add_url_rule('/silent_execution', 'silent execution', self.silent_execution_callback, ['GET'])
         self.webserver.add_url_rule('/upload_config', 'configuration update', self.upload_configuration_callback, ['POST'])
         self.webserver.add_url_rule('/get_config', 'configuration', self.download_configuration_callback, ['GET'])
+        self.webserver.add_url_rule('/metrics', 'metrics', self.metrics_callback, ['GET'])
+        self.webserver.add_url_rule('/stream', 'frame stream', self.stream_callback, ['GET'])
+        self.webserver.add_url_rule('/events', 'result events', self.events_callback, ['GET'])
         self.webserver.add_url_rule('/', 'homepage', self.homepage_callback, ['GET'])
         self.connect()
 
@@ -39,15 +102,203 @@ class RestAPIShell(Shell):
         self.planteye_config = config
 
     def attach_callback(self, callback: callable):
-        self.response_callback = callback
+        self.execution_callback = callback
 
     def attach_silent_execution_callback(self, callback: callable):
         self.silent_execution_callback = callback
 
+    def response_callback(self):
+        media_type = request.accept_mimetypes.best_match([self.JSON_MEDIA_TYPE, CONTAINER_MEDIA_TYPE],
+                                                         default=self.JSON_MEDIA_TYPE)
+        supported_formats = self.CONTAINER_IMAGE_FORMATS if media_type == CONTAINER_MEDIA_TYPE \
+            else self.JSON_IMAGE_FORMATS
+        try:
+            image_format, level = self.negotiate_image_encoding(media_type, supported_formats)
+            projection = self.parse_projection()
+        except ValueError as exc:
+            return str(exc), 400
+
+        result = self.latest_result()
+        if result is None:
+            return 'No pipeline result available yet', 503
+        try:
+            response = self.result_response(result, media_type, image_format, level, projection)
+        except Exception:
+            result.release()
+            raise
+        # The lease of the result ends once the (possibly streamed) body is sent
+        response.call_on_close(result.release)
+        return response
+
+    def result_response(self, result, media_type: str, image_format: str, level: int, projection):
+        etag = self.result_etag(result, media_type, image_format, level)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        # The shared result is not changed, the projection refers to its data
+        chunks = projection.execute(result.chunks) if projection is not None else result.chunks
+        fields = projection.fields if projection is not None else None
+        metadata = self.result_metadata(result)
+        streaming = self.config.parameters['streaming']
+        if media_type == CONTAINER_MEDIA_TYPE:
+            encoder = EncodeChunksToContainer(image_format, level, encoding_pool=self.encoding_pool,
+                                              metadata=metadata, fields=fields)
+        else:
+            encoder = EncodeChunksToJson(image_format, level, memoise=not streaming, encoding_pool=self.encoding_pool,
+                                         metadata=metadata, fields=fields)
+
+        # Base64 encoded images hardly compress, only JSON responses without images are compressed
+        content_encoding = None
+        if media_type == self.JSON_MEDIA_TYPE and not self.contains_images(chunks):
+            content_encoding = request.accept_encodings.best_match(list(CONTENT_ENCODINGS.keys()))
+
+        if streaming:
+            body = encoder.execute_streaming(chunks)
+            if content_encoding is not None:
+                body = compress_parts(body, content_encoding)
+        else:
+            body = encoder.execute(chunks)
+            if content_encoding is not None:
+                body = compress(body, content_encoding)
+
+        response = Response(body, mimetype=media_type)
+        # Weak, since metadata added per response (result_age) differs between responses of the same execution
+        response.set_etag(etag, weak=True)
+        response.vary.update(['Accept', 'Accept-Encoding'])
+        if content_encoding is not None:
+            response.headers['Content-Encoding'] = content_encoding
+        return response
+
+    def result_etag(self, result, media_type: str, image_format: str, level: int):
+        variant = f'{media_type}|{image_format}|{level}|{request.query_string.decode("latin-1")}'
+        # Tagged by content, not by execution, thus a new execution of an unchanged scene is answered with 304
+        return f'{self.instance_id}-{result.content_tag()}-{zlib.crc32(variant.encode("utf-8")):08x}'
+
+    @staticmethod
+    def contains_images(chunks: list):
+        for chunk in chunks:
+            if chunk.hidden:
+                continue
+            for chunk_data in chunk.data:
+                if isinstance(chunk_data, DataChunkImage) and isinstance(chunk_data.value, np.ndarray):
+                    return True
+        return False
+
+    def publishing_execution(self):
+        result = self.execution_callback()
+        self.event_publisher.publish(result)
+        return result
+
+    def background_execution(self):
+        try:
+            self.latest_result_slot.put(self.coalescer.execute())
+        except Exception as exc:
+            logging.error('Pipeline execution of background loop failed', exc_info=exc)
+
+    def latest_result(self):
+        if self.latest_result_slot is not None:
+            return self.latest_result_slot.get(self.FIRST_RESULT_TIMEOUT)
+        return self.coalescer.execute()
+
+    def result_metadata(self, result):
+        # The age of a result served from the background loop is known only when it is serialised
+        if self.latest_result_slot is None:
+            return None
+        return {'result_age': result.age()}
+
+    def events_callback(self):
+        chunk_names = request.args.get('chunks')
+        if chunk_names is not None:
+            chunk_names = chunk_names.split(',')
+        # Events are meant for lightweight updates, images are only included if asked for
+        images = request.args.get('images', 'none')
+        if images not in ['all', 'none']:
+            return f'Unsupported images {images}, supported are all and none', 400
+        return Response(self.event_publisher.events(chunk_names, images == 'all'), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'})
+
+    def stream_callback(self):
+        return Response(self.frame_broadcaster.stream(),
+                        mimetype=f'multipart/x-mixed-replace; boundary={MULTIPART_BOUNDARY}')
+
+    def negotiate_image_encoding(self, media_type: str, supported_formats: list):
+        # Query parameters take precedence over the Accept header, which takes precedence over the configuration
+        image_encoding = self.config.image_encoding
+        image_format = request.args.get('image_format')
+        if image_format is None:
+            image_format = self.accepted_image_format(media_type)
+        if image_format is None:
+            image_format = image_encoding.image_format
+            if image_format not in supported_formats:
+                image_format = 'png'
+        if image_format not in supported_formats:
+            raise ValueError(f'Unsupported image format {image_format}')
+
+        level = request.args.get('image_quality')
+        if level is None:
+            return image_format, image_encoding.level if image_format == image_encoding.image_format else None
+        level_range = (0, 9) if image_format == 'png' else (0, 100)
+        if image_format == 'raw' or not level.isdigit() or not level_range[0] <= int(level) <= level_range[1]:
+            raise ValueError(f'Unsupported image quality {level} for image format {image_format}')
+        return image_format, int(level)
+
+    @staticmethod
+    def parse_projection():
+        # Without any of the query parameters, the whole result is returned
+        chunk_names = request.args.get('chunks')
+        fields = request.args.get('fields')
+        images = request.args.get('images', 'all')
+        max_image_size = request.args.get('max_image_size')
+        if chunk_names is None and fields is None and images == 'all' and max_image_size is None:
+            return None
+
+        if chunk_names is not None:
+            chunk_names = chunk_names.split(',')
+        if fields is not None:
+            fields = fields.split(',')
+            unknown_fields = [field for field in fields if field not in CHUNK_FIELDS]
+            if len(unknown_fields) > 0:
+                raise ValueError(f'Unsupported fields {",".join(unknown_fields)}, supported are {",".join(CHUNK_FIELDS)}')
+        if images not in ['all', 'none']:
+            raise ValueError(f'Unsupported images {images}, supported are all and none')
+        if max_image_size is not None:
+            if not max_image_size.isdigit() or int(max_image_size) == 0:
+                raise ValueError(f'Unsupported max_image_size {max_image_size}, must be a positive integer')
+            max_image_size = int(max_image_size)
+        return ProjectChunks(chunk_names, fields, images == 'all', max_image_size)
+
+    def accepted_image_format(self, media_type: str):
+        # An image media type is only honoured if the client ranks it above the explicitly listed response media
+        # type and above */*, browsers list image types in every navigation request without listing JSON
+        qualities = dict(request.accept_mimetypes)
+        if media_type not in qualities:
+            return None
+        min_quality = max(qualities[media_type], qualities.get('*/*', 0))
+        # Accept values are sorted by their quality, the most preferred image media type is chosen
+        for accepted_media_type, quality in request.accept_mimetypes:
+            if accepted_media_type in self.IMAGE_MEDIA_TYPES and quality > min_quality:
+                return self.IMAGE_MEDIA_TYPES[accepted_media_type]
+        return None
+
+    @staticmethod
+    def serialize_json(chunks: list):
+        return EncodeChunksToJson().execute(chunks)
+
+    def serialize_event(self, chunks: list, images: bool):
+        if not images:
+            chunks = ProjectChunks(images=False).execute(chunks)
+        return EncodeChunksToJson(encoding_pool=self.encoding_pool).execute(chunks)
+
     def homepage_callback(self):
         welcome_str = 'Welcome to PlantEye API. Available endpoint is %s' % self.config.parameters['endpoint']
         return welcome_str
 
+    @staticmethod
+    def metrics_callback():
+        return Response(metrics.as_prometheus(), mimetype='text/plain; version=0.0.4')
+
     def download_configuration_callback(self):
         return jsonify(self.planteye_config.cfg_dict)
 
@@ -60,10 +311,10 @@ class RestAPIShell(Shell):
             uploaded_cfg = request.json
             print(uploaded_cfg)
 
-            self.pipeline_executor.config.update(uploaded_cfg)
-            self.pipeline_executor.update_configuration()
-
-            return 'Configuration applied'
+            if self.pipeline_executor.update_configuration(uploaded_cfg):
+                return 'Configuration applied'
+            else:
+                return 'Configuration invalid, previous configuration kept'
         else:
             return 'Content-Type not supported! Only json application/json is supported!'
 
@@ -75,21 +326,57 @@ class RestAPIShell(Shell):
         self.webserver_thread.start()
 
     def disconnect(self):
-        pass
+        if self.background_scheduler is not None:
+            self.background_scheduler.stop()
+        if self.webserver is not None:
+            self.webserver.shutdown()
+        if self.encoding_pool is not None:
+            self.encoding_pool.shutdown()
 
 
 class RestAPIWebserver:
-    def __init__(self, name: str, host: str, port: int):
+    """
+    This class describes the webserver of the REST API shell.
+    The development server of Flask is used by default, the production server is the multi-threaded WSGI server
+    waitress with a pool of worker threads, a limit of open (keep-alive) connections and a listen backlog.
+    """
+    def __init__(self, name: str, host: str, port: int, server: str = 'development', server_options: dict = None):
         self.name = name
         self.host = host
         self.port = port
+        self.server = server
+        self.server_options = server_options or {}
         self.endpoint_flask_app = Flask(name)
+        self.production_server = None
 
     def add_url_rule(self, endpoint: str, name: str, rule: callable, methods):
         self.endpoint_flask_app.add_url_rule(endpoint, name, rule, methods=methods)
 
     def run(self):
+        if self.server == 'production':
+            try:
+                from waitress import create_server
+            except ImportError:
+                logging.error('Production server requires package waitress, development server started instead')
+            else:
+                self.run_production_server(create_server)
+                return
         try:
             self.endpoint_flask_app.run(host=self.host, port=self.port)
         except PermissionError:
             logging.error('Cannot not start flask server with given configuration')
+
+    def run_production_server(self, create_server: callable):
+        try:
+            self.production_server = create_server(self.endpoint_flask_app, host=self.host, port=self.port,
+                                                   ident=self.name, **self.server_options)
+        except OSError as exc:
+            logging.error('Cannot not start production server with given configuration', exc_info=exc)
+            return
+        logging.info(f'Production server listening on {self.host}:{self.port} '
+                     f'({self.server_options.get("threads")} threads)')
+        self.production_server.run()
+
+    def shutdown(self):
+        if self.production_server is not None:
+            self.production_server.close()